@@ -4,10 +4,15 @@ Phoenix AI - Intelligent E2E Testing & Automation Platform
 Startup Script
 """
 
+import argparse
 import os
 import sys
 from pathlib import Path
 
+# Mirrors the keys of src.webui.interface.theme_map, kept here so argument
+# parsing (and --help) doesn't have to import the gradio UI stack
+THEME_NAMES = ("Default", "Soft", "Monochrome", "Glass", "Origin", "Citrus", "Ocean", "Base")
+
 # ASCII Art Banner with Professional Grey & White theme
 BANNER = """
 \033[90m╔═══════════════════════════════════════════════════════════════════════╗
@@ -24,44 +29,86 @@ BANNER = """
 ╚═══════════════════════════════════════════════════════════════════════╝\033[0m
 """
 
+# ANSI escape sequences used by the startup output
+RESET = "\033[0m"
+BOLD = "\033[1m"
+UNDERLINE = "\033[4m"
+GREY = "\033[90m"
+LIGHT_GREY = "\033[37m"
+WHITE = "\033[97m"
+BOLD_WHITE = "\033[1;97m"
+CYAN = "\033[38;5;51m"
+YELLOW = "\033[38;5;226m"
+MUTED = "\033[38;5;248m"
+RULE = f"{GREY}{'═' * 75}{RESET}"
+
+# Static startup text, joined once so it goes out in a single write
+STARTUP_TEXT = f"{BANNER}\n\n{BOLD}{CYAN}🚀 Starting Phoenix AI...{RESET}\n\n"
+
+ENV_WARNING_TEXT = (
+    f"{YELLOW}⚠️  Warning: .env file not found!{RESET}\n"
+    f"{MUTED}   Create .env file from .env.example for full functionality{RESET}\n\n"
+)
+
+# Argument-dependent startup text; placeholders are filled in by main()
+STARTUP_TEMPLATE = f"""{GREY}🌐 Platform URL:{RESET} {BOLD}{UNDERLINE}http://{{ip}}:{{port}}{RESET}
+{GREY}🎨 Theme:{RESET} {BOLD}{{theme}}{RESET}
+{GREY}✨ Features:{RESET} {WHITE}PR Testing • API Integration • E2E Automation{RESET}
+
+{RULE}
+
+{BOLD_WHITE}📚 Documentation:{RESET}
+   {GREY}•{RESET} PR Testing:    {LIGHT_GREY}docs/PR_TESTING_TOOL.md{RESET}
+   {GREY}•{RESET} API Testing:   {LIGHT_GREY}docs/API_TESTING.md{RESET}
+   {GREY}•{RESET} Azure DevOps:  {LIGHT_GREY}docs/AZURE_DEVOPS_SETUP.md{RESET}
+
+{RULE}
+
+{GREY}🔥{RESET} {BOLD_WHITE}Phoenix AI is ready to revolutionize your testing!{RESET} {GREY}🔥{RESET}
+
+"""
+
+
 def main():
-    print(BANNER)
-    print("\n\033[1m\033[38;5;51m🚀 Starting Phoenix AI...\033[0m\n")
+    sys.stdout.write(STARTUP_TEXT)
+    sys.stdout.flush()
     
-    # Check if .env file exists
-    env_file = Path(".env")
-    if not env_file.exists():
-        print("\033[38;5;226m⚠️  Warning: .env file not found!\033[0m")
-        print("\033[38;5;248m   Create .env file from .env.example for full functionality\033[0m\n")
+    parser = argparse.ArgumentParser(description="Phoenix AI - Intelligent Testing Platform")
+    parser.add_argument("--ip", type=str, default="127.0.0.1", help="IP address to bind to")
+    parser.add_argument("--port", type=int, default=7788, help="Port to listen on")
+    parser.add_argument("--theme", type=str, default="Ocean", choices=THEME_NAMES, 
+                      help="Theme to use for the UI")
+    args = parser.parse_args()
     
     # Import and run the webui
     try:
         from dotenv import load_dotenv
-        load_dotenv()
         
-        import argparse
+        # Resolve next to this script so launching from another directory still finds it;
+        # opening it directly tells a missing file apart from an empty one without a stat
+        env_file = Path(__file__).resolve().parent / ".env"
+        try:
+            with open(env_file, encoding="utf-8") as stream:
+                load_dotenv(stream=stream)
+        except FileNotFoundError:
+            sys.stdout.write(ENV_WARNING_TEXT)
+        
         from src.webui.interface import theme_map, create_ui
+        from src.utils.http_client import client_lifespan
         
-        parser = argparse.ArgumentParser(description="Phoenix AI - Intelligent Testing Platform")
-        parser.add_argument("--ip", type=str, default="127.0.0.1", help="IP address to bind to")
-        parser.add_argument("--port", type=int, default=7788, help="Port to listen on")
-        parser.add_argument("--theme", type=str, default="Ocean", choices=theme_map.keys(), 
-                          help="Theme to use for the UI")
-        args = parser.parse_args()
+        if args.theme not in theme_map:
+            parser.error(f"unknown theme: {args.theme}")
         
-        print(f"\033[90m🌐 Platform URL:\033[0m \033[1m\033[4mhttp://{args.ip}:{args.port}\033[0m")
-        print(f"\033[90m🎨 Theme:\033[0m \033[1m{args.theme}\033[0m")
-        print(f"\033[90m✨ Features:\033[0m \033[97mPR Testing • API Integration • E2E Automation\033[0m\n")
-        print("\033[90m" + "═" * 75 + "\033[0m")
-        print("\n\033[1;97m📚 Documentation:\033[0m")
-        print("   \033[90m•\033[0m PR Testing:    \033[37mdocs/PR_TESTING_TOOL.md\033[0m")
-        print("   \033[90m•\033[0m API Testing:   \033[37mdocs/API_TESTING.md\033[0m")
-        print("   \033[90m•\033[0m Azure DevOps:  \033[37mdocs/AZURE_DEVOPS_SETUP.md\033[0m")
-        print("\n\033[90m" + "═" * 75 + "\033[0m\n")
-        print("\033[90m🔥\033[0m \033[1;97mPhoenix AI is ready to revolutionize your testing!\033[0m \033[90m🔥\033[0m\n")
+        sys.stdout.write(STARTUP_TEMPLATE.format(ip=args.ip, port=args.port, theme=args.theme))
+        sys.stdout.flush()
         
         demo = create_ui(theme_name=args.theme)
-        demo.queue().launch(server_name=args.ip, server_port=args.port)
+        # Close the shared Azure DevOps HTTP client on the server loop when the app shuts down
+        demo.queue().launch(
+            server_name=args.ip,
+            server_port=args.port,
+            app_kwargs={"lifespan": client_lifespan}
+        )
         
     except ImportError as e:
         print(f"❌ Error: Missing dependencies - {e}")
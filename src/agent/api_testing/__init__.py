@@ -1,15 +1,7 @@
 """
 Initialize API Testing module
 """
-from .api_testing_agent import (
-    APITestingAgent,
-    GherkinGenerator,
-    APIValidator,
-    GherkinScenario,
-    APITestConfig,
-    UIValidationConfig,
-    TestResult
-)
+import importlib
 
 __all__ = [
     'APITestingAgent',
@@ -20,3 +12,20 @@ __all__ = [
     'UIValidationConfig',
     'TestResult'
 ]
+
+# Exports are resolved on first access (PEP 562) so importing the package,
+# or only its schemas, doesn't pull in the agent's LLM/browser dependencies
+_LAZY_EXPORTS = {name: '.api_testing_agent' for name in __all__}
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        module = importlib.import_module(_LAZY_EXPORTS[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
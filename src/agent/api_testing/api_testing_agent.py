@@ -2,23 +2,125 @@
 API Testing Agent with Gherkin Generator and Validation Capabilities
 """
 import json
+import logging
+import os
+import random
 import re
+from functools import lru_cache
 from typing import Dict, List, Optional, Any, Tuple
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields
 import asyncio
-from datetime import datetime
-import requests
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from pathlib import Path
+from urllib.parse import urlsplit
+
+import aiohttp
+import orjson
+try:
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None  # type: ignore
 
 from langchain_core.messages import HumanMessage, SystemMessage
 from browser_use import Agent, Controller
 from pydantic import BaseModel
 
 from src.utils.llm_provider import get_llm_model
+from src.utils.llm_cache import LLMCache, get_default_cache
+from src.utils.json_stream import find_json_block, stream_json_block
 from src.browser.custom_browser import CustomBrowser
+from src.agent.api_testing.schemas import TestStatus
+
+logger = logging.getLogger(__name__)
+
+# Patterns used while parsing LLM output and Gherkin steps
+_QUOTED_RE = re.compile(r'"([^"]+)"')
+_DIGITS_RE = re.compile(r'\d+')
+_SHOULD_CONTAIN_RE = re.compile(r'should contain.*?"([^"]+)"', re.IGNORECASE)
+# Checked in this order, so a step naming several methods resolves to the first listed here
+_METHOD_PHRASES = (('GET', 'GET request'), ('POST', 'POST request'),
+                   ('PUT', 'PUT request'), ('DELETE', 'DELETE request'))
+
+# Transient-failure handling for outgoing API requests
+_RETRY_STATUSES = frozenset((429, 502, 503, 504))
+_IDEMPOTENT_METHODS = frozenset(('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'))
+_MAX_ATTEMPTS = 4
+_MAX_RETRY_DELAY = 30.0
+_PER_HOST_CONCURRENCY = 20
+
+# Queued on a closed browser pool to wake its waiters; each waiter puts it back for the next
+_POOL_CLOSED = object()
+
+
+def _retry_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+    """Seconds to wait before the next attempt: Retry-After when given, else exponential backoff with jitter"""
+    if retry_after:
+        try:
+            return min(_MAX_RETRY_DELAY, max(0.0, float(retry_after)))
+        except ValueError:
+            try:
+                wait = (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds()
+                return min(_MAX_RETRY_DELAY, max(0.0, wait))
+            except (TypeError, ValueError):
+                pass
+    return min(_MAX_RETRY_DELAY, 2 ** attempt + random.random())
+
+
+async def _read_response_data(response: aiohttp.ClientResponse) -> Any:
+    """Parse a response body as JSON only when its Content-Type says so, else wrap its text"""
+    content_type = response.content_type
+    if content_type == 'application/json' or content_type.endswith('+json'):
+        raw = await response.read()
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            return {'text': raw.decode(response.charset or 'utf-8', errors='replace')}
+    return {'text': await response.text()}
+
 
+def _step_method(line: str) -> Optional[str]:
+    """HTTP method requested by a Gherkin step line, if any"""
+    for method, phrase in _METHOD_PHRASES:
+        if phrase in line:
+            return method
+    return None
 
-@dataclass
+
+@lru_cache(maxsize=1024)
+def _compile_path(path: str) -> Tuple[Tuple[str, Optional[int]], ...]:
+    """Split a dot-notation path (e.g. "data.items[0].id") into (key, index) steps, once per path"""
+    steps = []
+    for key in path.split('.'):
+        # Handle array indexing
+        if '[' in key and ']' in key:
+            steps.append((key.split('[')[0], int(key.split('[')[1].split(']')[0])))
+        else:
+            steps.append((key, None))
+    return tuple(steps)
+
+
+# Only schemas declaring "$schema" are compiled; anything else is a description for the LLM
+_JSON_SCHEMA_MARKER = '$schema'
+
+
+@lru_cache(maxsize=256)
+def _compile_schema(schema_json: str):
+    """Compile a JSON Schema (given as canonical JSON text) into a validator function"""
+    return fastjsonschema.compile(json.loads(schema_json))
+
+
+@dataclass(slots=True)
+class HTTPResponse:
+    """Status, headers and parsed body of a completed API request"""
+    status_code: int
+    headers: Dict[str, str]
+    data: Any
+    response_time_ms: float
+
+
+@dataclass(slots=True)
 class GherkinScenario:
     """Represents a Gherkin scenario"""
     feature: str
@@ -29,7 +131,7 @@ class GherkinScenario:
     background: Optional[List[str]] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class APITestConfig:
     """Configuration for API testing"""
     base_url: str
@@ -44,7 +146,7 @@ class APITestConfig:
     extract_values: Optional[Dict[str, str]] = None  # JSONPath expressions to extract values
 
 
-@dataclass
+@dataclass(slots=True)
 class UIValidationConfig:
     """Configuration for UI validation after API call"""
     url: str
@@ -52,7 +154,7 @@ class UIValidationConfig:
     expected_values: Dict[str, Any]  # Values extracted from API to validate in UI
 
 
-@dataclass
+@dataclass(slots=True)
 class TestResult:
     """Test execution result"""
     success: bool
@@ -65,20 +167,38 @@ class TestResult:
     execution_time: float = 0.0
 
 
+@dataclass(slots=True)
+class FormattedTestResult:
+    """Scenario execution result in the shape the web UI renders"""
+    status: TestStatus
+    execution_time: float
+    timestamp: datetime
+    api_endpoint: str
+    status_code: int
+    response_time_ms: float
+    extracted_values: Dict[str, Any]
+    validation_errors: List[str]
+    message: str
+    response_data: Any  # Full response data
+
+
 class GherkinGenerator:
     """Generates Gherkin scenarios from natural language descriptions"""
     
-    def __init__(self, llm_provider: str, model_name: str, api_key: str, base_url: Optional[str] = None):
-        self.llm = get_llm_model(
+    def __init__(self, llm_provider: str, model_name: str, api_key: str, base_url: Optional[str] = None, llm: Any = None):
+        self.llm = llm or get_llm_model(
             llm_provider,
             model_name=model_name,
             api_key=api_key,
             base_url=base_url,
             temperature=0.0
         )
+        self.cache_namespace = LLMCache.make_namespace(llm_provider, model_name, base_url, 0.0)
     
-    async def generate_gherkin(self, description: str, context: Optional[str] = None) -> GherkinScenario:
-        """Generate Gherkin scenario from natural language description"""
+    async def generate_gherkin(
+        self, description: str, context: Optional[str] = None, refresh: bool = False
+    ) -> GherkinScenario:
+        """Generate Gherkin scenario from natural language description (refresh bypasses the LLM cache)"""
         system_prompt = """You are an expert at writing Gherkin BDD scenarios for API testing.
 Generate a well-structured Gherkin scenario based on the user's description.
 
@@ -114,15 +234,16 @@ Return the scenario in a structured JSON format with fields:
             HumanMessage(content=user_message)
         ]
         
-        response = await self.llm.ainvoke(messages)
+        content = await get_default_cache().get_or_call(
+            self.cache_namespace, messages, lambda msgs: stream_json_block(self.llm, msgs), refresh=refresh
+        )
         
         # Parse the response
         try:
             # Extract JSON from response
-            content = response.content
-            json_match = re.search(r'\{.*\}', content, re.DOTALL)
-            if json_match:
-                scenario_data = json.loads(json_match.group())
+            json_block = find_json_block(content)
+            if json_block:
+                scenario_data = json.loads(json_block)
                 return GherkinScenario(**scenario_data)
             else:
                 # Fallback: parse manually
@@ -177,14 +298,72 @@ Return the scenario in a structured JSON format with fields:
 class APIValidator:
     """Validates API responses against expected criteria"""
     
-    def __init__(self, llm_provider: str, model_name: str, api_key: str, base_url: Optional[str] = None):
-        self.llm = get_llm_model(
+    def __init__(self, llm_provider: str, model_name: str, api_key: str, base_url: Optional[str] = None, llm: Any = None):
+        self.llm = llm or get_llm_model(
             llm_provider,
             model_name=model_name,
             api_key=api_key,
             base_url=base_url,
             temperature=0.0
         )
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+    
+    async def get_session(self) -> aiohttp.ClientSession:
+        """Get the pooled HTTP session, creating it on first use inside the running loop"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=100,
+                    limit_per_host=20,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=30
+                ),
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+        return self._session
+    
+    async def send_request(self, method: str, url: str, **kwargs) -> HTTPResponse:
+        """
+        Send a request through the pooled session, limited per host and retried on transient failures.
+        Idempotent methods retry on 429/502/503/504 and connection errors; others only on 429.
+        """
+        session = await self.get_session()
+        host = urlsplit(url).netloc
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._host_semaphores[host] = asyncio.Semaphore(_PER_HOST_CONCURRENCY)
+        
+        retryable = _RETRY_STATUSES if method.upper() in _IDEMPOTENT_METHODS else frozenset((429,))
+        for attempt in range(_MAX_ATTEMPTS):
+            last_attempt = attempt == _MAX_ATTEMPTS - 1
+            try:
+                async with semaphore:
+                    request_start = time.perf_counter()
+                    async with session.request(method=method, url=url, **kwargs) as response:
+                        response_time_ms = (time.perf_counter() - request_start) * 1000
+                        if last_attempt or response.status not in retryable:
+                            return HTTPResponse(
+                                status_code=response.status,
+                                # multidict keys are istr; plain str keys keep the dict serializable
+                                headers={str(k): v for k, v in response.headers.items()},
+                                data=await _read_response_data(response),
+                                response_time_ms=response_time_ms
+                            )
+                        delay = _retry_delay(attempt, response.headers.get('Retry-After'))
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if last_attempt or method.upper() not in _IDEMPOTENT_METHODS:
+                    raise
+                delay = _retry_delay(attempt)
+            
+            logger.debug(f"Retrying {method} {url} in {delay:.1f}s (attempt {attempt + 2}/{_MAX_ATTEMPTS})")
+            await asyncio.sleep(delay)
+    
+    async def close(self):
+        """Close the pooled HTTP session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
     
     async def execute_api_test(self, config: APITestConfig) -> Tuple[bool, Dict[str, Any], Optional[Dict[str, Any]]]:
         """Execute API test and return success status, response, and extracted values"""
@@ -195,8 +374,7 @@ class APIValidator:
             kwargs = {
                 'method': config.method.upper(),
                 'url': url,
-                'headers': config.headers or {},
-                'timeout': 30
+                'headers': config.headers
             }
             
             if config.query_params:
@@ -207,27 +385,25 @@ class APIValidator:
             
             if config.auth:
                 if 'bearer' in config.auth:
-                    kwargs['headers']['Authorization'] = f"Bearer {config.auth['bearer']}"
+                    # Copy only when adding auth so the caller's headers dict is never mutated
+                    kwargs['headers'] = {**(config.headers or {}), 'Authorization': f"Bearer {config.auth['bearer']}"}
                 elif 'basic' in config.auth:
-                    kwargs['auth'] = (config.auth['basic']['username'], config.auth['basic']['password'])
+                    kwargs['auth'] = aiohttp.BasicAuth(config.auth['basic']['username'], config.auth['basic']['password'])
             
             # Execute request
-            response = requests.request(**kwargs)
+            response = await self.send_request(**kwargs)
+            status_code = response.status_code
+            response_headers = response.headers
+            response_data = response.data
             
             # Validate status code
-            if response.status_code != config.expected_status:
+            if status_code != config.expected_status:
                 return False, {
-                    'status_code': response.status_code,
-                    'body': response.text,
-                    'error': f"Expected status {config.expected_status}, got {response.status_code}"
+                    'status_code': status_code,
+                    'body': response_data,
+                    'error': f"Expected status {config.expected_status}, got {status_code}"
                 }, None
             
-            # Parse response
-            try:
-                response_data = response.json()
-            except:
-                response_data = {'text': response.text}
-            
             # Extract values if specified
             extracted_values = None
             if config.extract_values:
@@ -235,18 +411,19 @@ class APIValidator:
             
             # Validate response schema if specified
             if config.expected_response_schema:
-                schema_valid = await self._validate_schema(response_data, config.expected_response_schema)
+                schema_valid, schema_error = await self._validate_schema(response_data, config.expected_response_schema)
                 if not schema_valid:
+                    error = 'Response schema validation failed'
                     return False, {
-                        'status_code': response.status_code,
+                        'status_code': status_code,
                         'body': response_data,
-                        'error': 'Response schema validation failed'
+                        'error': f"{error}: {schema_error}" if schema_error else error
                     }, extracted_values
             
             return True, {
-                'status_code': response.status_code,
+                'status_code': status_code,
                 'body': response_data,
-                'headers': dict(response.headers)
+                'headers': response_headers
             }, extracted_values
             
         except Exception as e:
@@ -268,22 +445,35 @@ class APIValidator:
     
     def _get_nested_value(self, data: Any, path: str) -> Any:
         """Get nested value from data using dot notation"""
-        keys = path.split('.')
         current = data
         
-        for key in keys:
-            # Handle array indexing
-            if '[' in key and ']' in key:
-                key_name = key.split('[')[0]
-                index = int(key.split('[')[1].split(']')[0])
-                current = current[key_name][index]
-            else:
-                current = current[key]
+        for key, index in _compile_path(path):
+            current = current[key]
+            if index is not None:
+                current = current[index]
         
         return current
     
-    async def _validate_schema(self, response_data: Dict[str, Any], schema: Dict[str, Any]) -> bool:
-        """Use LLM to validate response schema"""
+    async def _validate_schema(
+        self, response_data: Dict[str, Any], schema: Dict[str, Any]
+    ) -> Tuple[bool, Optional[str]]:
+        """
+        Validate response against schema and return (valid, reason)
+
+        Schemas declaring "$schema" are compiled and checked locally; a schema that fails to
+        compile is a failed validation. Anything else is judged by the LLM.
+        """
+        if fastjsonschema is not None and _JSON_SCHEMA_MARKER in schema:
+            try:
+                validate = _compile_schema(json.dumps(schema, sort_keys=True))
+            except (fastjsonschema.JsonSchemaDefinitionException, re.error) as e:
+                return False, f"invalid JSON Schema: {e}"
+            try:
+                validate(response_data)
+                return True, None
+            except fastjsonschema.JsonSchemaValueException as e:
+                return False, e.message
+        
         system_prompt = """You are validating API response against expected schema.
 Check if the response data matches the schema requirements.
 Return only 'VALID' or 'INVALID' followed by a brief explanation."""
@@ -302,8 +492,9 @@ Is the response valid according to the schema?"""
             HumanMessage(content=user_message)
         ]
         
+        # Verdicts aren't cached: the same response can pass today and fail after a deploy
         response = await self.llm.ainvoke(messages)
-        return 'VALID' in response.content.upper()
+        return 'VALID' in response.content.upper(), None
 
 
 class APITestingAgent:
@@ -315,7 +506,9 @@ class APITestingAgent:
         model_name: str,
         api_key: str,
         base_url: Optional[str] = None,
-        browser_config: Optional[Dict[str, Any]] = None
+        browser_config: Optional[Dict[str, Any]] = None,
+        max_concurrency: int = 10,
+        max_browsers: int = 2
     ):
         self.llm_provider = llm_provider
         self.model_name = model_name
@@ -323,27 +516,90 @@ class APITestingAgent:
         self.base_url = base_url
         self.browser_config = browser_config or {}
         
-        self.gherkin_generator = GherkinGenerator(llm_provider, model_name, api_key, base_url)
-        self.api_validator = APIValidator(llm_provider, model_name, api_key, base_url)
+        # One LLM client (and its connection pool) shared by every collaborator
+        self.llm = get_llm_model(
+            llm_provider,
+            model_name=model_name,
+            api_key=api_key,
+            base_url=base_url,
+            temperature=0.0
+        )
+        self.cache_namespace = LLMCache.make_namespace(llm_provider, model_name, base_url, 0.0)
+        self.gherkin_generator = GherkinGenerator(llm_provider, model_name, api_key, base_url, llm=self.llm)
+        self.api_validator = APIValidator(llm_provider, model_name, api_key, base_url, llm=self.llm)
         
         self.test_results: List[TestResult] = []
+        
+        # Caps in-flight scenario requests so execute_many can't flood the target API
+        self._request_semaphore = asyncio.Semaphore(max_concurrency)
+        
+        # UI validations reuse up to max_browsers browsers instead of launching one per call
+        self._max_browsers = max_browsers
+        self._browsers: List[CustomBrowser] = []
+        self._browser_pool: asyncio.Queue = asyncio.Queue(maxsize=max_browsers)
+        self._controller = Controller()
     
-    async def generate_gherkin_from_prompt(self, prompt: str, context: Optional[str] = None) -> str:
-        """Generate Gherkin scenario from natural language prompt"""
-        scenario = await self.gherkin_generator.generate_gherkin(prompt, context)
+    async def close(self):
+        """
+        Release pooled HTTP connections and browsers held by the agent
+
+        Idle browsers are closed now and browsers still in use when they are released; callers
+        waiting for a browser get a RuntimeError. Later calls start a fresh pool.
+        """
+        await self.api_validator.close()
+        pool, self._browser_pool = self._browser_pool, asyncio.Queue(maxsize=self._max_browsers)
+        self._browsers = []
+        idle = []
+        while not pool.empty():
+            idle.append(pool.get_nowait())
+        pool.put_nowait(_POOL_CLOSED)
+        for browser in idle:
+            await self._close_browser(browser)
+    
+    async def _acquire_browser(self) -> CustomBrowser:
+        """Take an idle pooled browser, launching a new one while under the pool size"""
+        pool = self._browser_pool
+        try:
+            return pool.get_nowait()
+        except asyncio.QueueEmpty:
+            pass
+        if len(self._browsers) < self._max_browsers:
+            browser = CustomBrowser(config=self.browser_config)
+            self._browsers.append(browser)
+            return browser
+        browser = await pool.get()
+        if browser is _POOL_CLOSED:
+            pool.put_nowait(_POOL_CLOSED)
+            raise RuntimeError("Agent was closed while waiting for a browser")
+        return browser
+    
+    async def _release_browser(self, browser: CustomBrowser):
+        """Return a browser to the pool for the next UI validation, or close it if the pool was closed"""
+        if browser in self._browsers:
+            self._browser_pool.put_nowait(browser)
+        else:
+            await self._close_browser(browser)
+    
+    @staticmethod
+    async def _close_browser(browser: CustomBrowser):
+        try:
+            await browser.close()
+        except Exception as e:
+            logger.warning(f"Failed to close browser: {e}")
+    
+    async def generate_gherkin_from_prompt(
+        self, prompt: str, context: Optional[str] = None, refresh: bool = False
+    ) -> str:
+        """Generate Gherkin scenario from natural language prompt (refresh bypasses the LLM cache)"""
+        scenario = await self.gherkin_generator.generate_gherkin(prompt, context, refresh=refresh)
         
         # Format as Gherkin text
-        gherkin_text = f"Feature: {scenario.feature}\n\n"
-        gherkin_text += f"Scenario: {scenario.scenario}\n"
+        parts = [f"Feature: {scenario.feature}\n\n", f"Scenario: {scenario.scenario}\n"]
+        parts.extend(f"  Given {step}\n" for step in scenario.given)
+        parts.extend(f"  When {step}\n" for step in scenario.when)
+        parts.extend(f"  Then {step}\n" for step in scenario.then)
         
-        for step in scenario.given:
-            gherkin_text += f"  Given {step}\n"
-        for step in scenario.when:
-            gherkin_text += f"  When {step}\n"
-        for step in scenario.then:
-            gherkin_text += f"  Then {step}\n"
-        
-        return gherkin_text
+        return "".join(parts)
     
     async def parse_and_execute_gherkin(
         self,
@@ -352,7 +608,7 @@ class APITestingAgent:
         ui_validation: Optional[UIValidationConfig] = None
     ) -> TestResult:
         """Parse Gherkin scenario and execute tests"""
-        start_time = asyncio.get_event_loop().time()
+        start_time = time.perf_counter()
         
         # Parse Gherkin
         scenario = self._parse_gherkin_scenario(gherkin_text)
@@ -372,7 +628,7 @@ class APITestingAgent:
             if not ui_result['success']:
                 errors.extend(ui_result.get('errors', []))
         
-        end_time = asyncio.get_event_loop().time()
+        execution_time = time.perf_counter() - start_time
         
         result = TestResult(
             success=api_success and (not ui_validation or (ui_result and ui_result['success'])),
@@ -382,7 +638,7 @@ class APITestingAgent:
             ui_validation_result=ui_result,
             extracted_values=extracted_values,
             errors=errors if errors else None,
-            execution_time=end_time - start_time
+            execution_time=execution_time
         )
         
         self.test_results.append(result)
@@ -398,24 +654,16 @@ class APITestingAgent:
         extracted_values: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Execute UI validation using browser agent"""
+        browser = None
         try:
-            # Create browser and controller
-            browser = CustomBrowser(config=self.browser_config)
-            controller = Controller()
+            browser = await self._acquire_browser()
             
             # Create agent
-            llm = get_llm_model(
-                self.llm_provider,
-                model_name=self.model_name,
-                api_key=self.api_key,
-                base_url=self.base_url,
-                temperature=0.0
-            )
             agent = Agent(
                 task="",
-                llm=llm,
+                llm=self.llm,
                 browser=browser,
-                controller=controller
+                controller=self._controller
             )
             
             # Build validation task
@@ -442,6 +690,9 @@ class APITestingAgent:
                 'success': False,
                 'errors': [f"UI validation failed: {str(e)}"]
             }
+        finally:
+            if browser is not None:
+                await self._release_browser(browser)
     
     async def _analyze_ui_validation(
         self,
@@ -450,14 +701,6 @@ class APITestingAgent:
         extracted_values: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Analyze UI validation results using LLM"""
-        llm = get_llm_model(
-            self.llm_provider,
-            model_name=self.model_name,
-            api_key=self.api_key,
-            base_url=self.base_url,
-            temperature=0.0
-        )
-        
         system_prompt = """You are analyzing UI validation results.
 Determine if the UI validation was successful by checking if the extracted API values
 match what was displayed/validated in the UI.
@@ -471,7 +714,7 @@ Expected Values in UI:
 {json.dumps(expected_values, indent=2)}
 
 Agent Execution History:
-{str(history)[-2000:]}  # Last 2000 chars
+{self._format_history_tail(history)}
 
 Did the UI validation succeed?"""
         
@@ -480,14 +723,15 @@ Did the UI validation succeed?"""
             HumanMessage(content=user_message)
         ]
         
-        response = await llm.ainvoke(messages)
+        content = await get_default_cache().get_or_call(
+            self.cache_namespace, messages, lambda msgs: stream_json_block(self.llm, msgs)
+        )
         
         try:
             # Extract JSON from response
-            content = response.content
-            json_match = re.search(r'\{.*\}', content, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group())
+            json_block = find_json_block(content)
+            if json_block:
+                return json.loads(json_block)
             else:
                 return {
                     'success': 'success' in content.lower(),
@@ -501,55 +745,93 @@ Did the UI validation succeed?"""
                 'errors': ['Failed to parse LLM response']
             }
     
+    @staticmethod
+    def _format_history_tail(history: Any, max_steps: int = 5, max_chars: int = 2000) -> str:
+        """Stringify only the last few agent steps instead of the whole history"""
+        steps = getattr(history, 'history', history)
+        if isinstance(steps, list):
+            return str(steps[-max_steps:])[-max_chars:]
+        return str(history)[-max_chars:]
+    
     def get_test_results(self) -> List[Dict[str, Any]]:
-        """Get all test results"""
-        return [asdict(result) for result in self.test_results]
+        """
+        Get all test results as a fresh list of dicts
+
+        The copy is shallow: nested values such as api_response and extracted_values are shared
+        with the stored results, so treat them as read-only (use copy.deepcopy to modify them).
+        """
+        return [{f.name: getattr(result, f.name) for f in fields(result)} for result in self.test_results]
     
     def save_test_results(self, output_path: str):
         """Save test results to file"""
         output_file = Path(output_path)
         output_file.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(output_file, 'w') as f:
-            json.dump(self.get_test_results(), f, indent=2)
+        try:
+            data = orjson.dumps(
+                self.test_results,
+                option=(orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_DATACLASS
+                        | orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS)
+            )
+        except orjson.JSONEncodeError:
+            # e.g. integers beyond 64 bits, which only the stdlib encoder handles
+            data = json.dumps(self.get_test_results(), indent=2).encode()
+        
+        # Write to a sibling temp file and swap it in so a crash never leaves a truncated file
+        tmp_file = output_file.with_suffix(output_file.suffix + '.tmp')
+        try:
+            tmp_file.write_bytes(data)
+            os.replace(tmp_file, output_file)
+        except BaseException:
+            tmp_file.unlink(missing_ok=True)
+            raise
     
     def generate_test_report(self) -> str:
         """Generate a formatted test report"""
-        report = "# API Testing Report\n\n"
-        report += f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-        
-        total_tests = len(self.test_results)
-        passed_tests = sum(1 for r in self.test_results if r.success)
-        failed_tests = total_tests - passed_tests
-        
-        report += f"## Summary\n"
-        report += f"- Total Tests: {total_tests}\n"
-        report += f"- Passed: {passed_tests}\n"
-        report += f"- Failed: {failed_tests}\n"
-        report += f"- Success Rate: {(passed_tests/total_tests*100) if total_tests > 0 else 0:.1f}%\n\n"
-        
-        report += "## Test Results\n\n"
+        # Per-result sections are built first so passes can be counted in the same traversal
+        body = []
+        ap = body.append
+        passed_tests = 0
         
         for i, result in enumerate(self.test_results, 1):
-            status = "✅ PASSED" if result.success else "❌ FAILED"
-            report += f"### Test {i}: {result.scenario_name} {status}\n"
-            report += f"- Execution Time: {result.execution_time:.2f}s\n"
-            report += f"- Timestamp: {result.timestamp}\n"
+            if result.success:
+                passed_tests += 1
+                status = "✅ PASSED"
+            else:
+                status = "❌ FAILED"
+            ap(f"### Test {i}: {result.scenario_name} {status}\n")
+            ap(f"- Execution Time: {result.execution_time:.2f}s\n")
+            ap(f"- Timestamp: {result.timestamp}\n")
             
             if result.api_response:
-                report += f"- API Status: {result.api_response.get('status_code', 'N/A')}\n"
+                ap(f"- API Status: {result.api_response.get('status_code', 'N/A')}\n")
             
             if result.extracted_values:
-                report += f"- Extracted Values: {json.dumps(result.extracted_values, indent=2)}\n"
+                extracted = orjson.dumps(result.extracted_values, option=orjson.OPT_INDENT_2).decode()
+                ap(f"- Extracted Values: {extracted}\n")
             
             if result.errors:
-                report += f"- Errors:\n"
+                ap("- Errors:\n")
                 for error in result.errors:
-                    report += f"  - {error}\n"
+                    ap(f"  - {error}\n")
             
-            report += "\n"
+            ap("\n")
+        
+        total_tests = len(self.test_results)
+        failed_tests = total_tests - passed_tests
         
-        return report
+        header = (
+            "# API Testing Report\n\n"
+            f"Generated: {datetime.now():%Y-%m-%d %H:%M:%S}\n\n"
+            "## Summary\n"
+            f"- Total Tests: {total_tests}\n"
+            f"- Passed: {passed_tests}\n"
+            f"- Failed: {failed_tests}\n"
+            f"- Success Rate: {(passed_tests/total_tests*100) if total_tests > 0 else 0:.1f}%\n\n"
+            "## Test Results\n\n"
+        )
+        
+        return header + "".join(body)
     
     def _validate_user_fields(self, response_data: Any, field_assertions: Dict[str, str]) -> bool:
         """
@@ -592,15 +874,7 @@ Did the UI validation succeed?"""
         Execute a Gherkin scenario by parsing it and making the appropriate API call.
         This is a simplified version that extracts API details from Gherkin steps.
         """
-        import time
-        from enum import Enum
-        
-        class TestStatus(Enum):
-            PASSED = "passed"
-            FAILED = "failed"
-            SKIPPED = "skipped"
-        
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         try:
             # Extract API details from Gherkin
@@ -608,39 +882,65 @@ Did the UI validation succeed?"""
             method = "GET"
             expected_status = 200
             
-            # Parse Gherkin text
+            # Parse Gherkin text in a single pass: request details are read directly,
+            # response checks are queued as (kind, argument) and run once the response arrives
             lines = gherkin_text.strip().split('\n')
             scenario_name = "API Test"
+            pending_checks: List[Tuple[str, Any]] = []
             
-            for line in lines:
-                line = line.strip()
+            i = 0
+            while i < len(lines):
+                line = lines[i].strip()
+                line_lower = line.lower()
+                i += 1
                 
                 # Extract scenario name
                 if line.startswith('Scenario:'):
                     scenario_name = line.replace('Scenario:', '').strip()
                 
                 # Extract API endpoint URL
-                if 'endpoint is' in line.lower() or 'url is' in line.lower():
+                if 'endpoint is' in line_lower or 'url is' in line_lower:
                     # Extract URL from quotes
-                    url_match = re.search(r'"([^"]+)"', line)
+                    url_match = _QUOTED_RE.search(line)
                     if url_match:
                         api_url = url_match.group(1)
                 
                 # Extract HTTP method
-                if 'GET request' in line:
-                    method = 'GET'
-                elif 'POST request' in line:
-                    method = 'POST'
-                elif 'PUT request' in line:
-                    method = 'PUT'
-                elif 'DELETE request' in line:
-                    method = 'DELETE'
+                method = _step_method(line) or method
                 
                 # Extract expected status code
-                if 'status code should be' in line.lower():
-                    status_match = re.search(r'\d+', line)
+                if 'status code should be' in line_lower:
+                    status_match = _DIGITS_RE.search(line)
                     if status_match:
                         expected_status = int(status_match.group())
+                
+                if 'should be a json array' in line_lower or 'should be an array' in line_lower:
+                    pending_checks.append(('array', None))
+                
+                # Handle table-based assertions (key-value pairs)
+                if 'following details:' in line_lower or 'with the following' in line_lower:
+                    # Consume the table rows that follow
+                    table_assertions = {}
+                    while i < len(lines):
+                        next_line = lines[i].strip()
+                        # Parse table row: | key | value |
+                        if not (next_line.startswith('Then |') or next_line.startswith('|')):
+                            break
+                        # Remove "Then" prefix if present
+                        table_line = next_line.replace('Then', '').strip()
+                        parts = [p.strip() for p in table_line.split('|') if p.strip()]
+                        if len(parts) == 2 and parts[0].lower() not in ['key', 'field', 'attribute']:
+                            # This is a data row, not header
+                            table_assertions[parts[0]] = parts[1]
+                        i += 1
+                    if table_assertions:
+                        pending_checks.append(('fields', table_assertions))
+                
+                # Simple "should contain" checks
+                if 'should contain' in line_lower and 'following' not in line_lower:
+                    content_match = _SHOULD_CONTAIN_RE.search(line)
+                    if content_match:
+                        pending_checks.append(('contains', content_match.group(1)))
             
             if not api_url:
                 return TestResult(
@@ -648,28 +948,23 @@ Did the UI validation succeed?"""
                     scenario_name=scenario_name,
                     timestamp=datetime.now().isoformat(),
                     errors=["Could not extract API URL from Gherkin scenario"],
-                    execution_time=time.time() - start_time
+                    execution_time=time.perf_counter() - start_time
                 )
             
             # Make the API call
             try:
-                response = requests.request(
-                    method=method,
-                    url=api_url,
-                    headers={'Content-Type': 'application/json'},
-                    timeout=30
-                )
-                
-                response_time_ms = response.elapsed.total_seconds() * 1000
-                
-                # Parse response
-                try:
-                    response_data = response.json()
-                except:
-                    response_data = {"text": response.text}
+                async with self._request_semaphore:
+                    response = await self.api_validator.send_request(
+                        method=method,
+                        url=api_url,
+                        headers={'Content-Type': 'application/json'}
+                    )
+                status_code = response.status_code
+                response_data = response.data
+                response_time_ms = response.response_time_ms
                 
                 # Validate status code
-                status_ok = response.status_code == expected_status
+                status_ok = status_code == expected_status
                 
                 # Check validations from Gherkin
                 validation_errors = []
@@ -677,64 +972,35 @@ Did the UI validation succeed?"""
                 
                 if not status_ok:
                     validation_errors.append(
-                        f"Expected status {expected_status}, got {response.status_code}"
+                        f"Expected status {expected_status}, got {status_code}"
                     )
                 
-                # Check for specific validations mentioned in Gherkin
-                i = 0
-                while i < len(lines):
-                    line = lines[i].strip()
-                    line_lower = line.lower()
-                    
-                    if 'should be a json array' in line_lower or 'should be an array' in line_lower:
+                # Run the checks collected from the Gherkin steps
+                response_str = None  # serialized lazily, at most once
+                for kind, arg in pending_checks:
+                    if kind == 'array':
                         if not isinstance(response_data, list):
                             validation_errors.append("Response is not a JSON array")
                     
-                    # Handle table-based assertions (key-value pairs)
-                    if 'following details:' in line_lower or 'with the following' in line_lower:
-                        # Look ahead for table rows
-                        i += 1
-                        table_assertions = {}
-                        while i < len(lines):
-                            next_line = lines[i].strip()
-                            # Parse table row: | key | value |
-                            if next_line.startswith('Then |') or next_line.startswith('|'):
-                                # Remove "Then" prefix if present
-                                table_line = next_line.replace('Then', '').strip()
-                                # Parse table row
-                                parts = [p.strip() for p in table_line.split('|') if p.strip()]
-                                if len(parts) == 2 and parts[0].lower() not in ['key', 'field', 'attribute']:
-                                    # This is a data row, not header
-                                    table_assertions[parts[0]] = parts[1]
-                                i += 1
-                            else:
-                                break
-                        
-                        # Validate table assertions
-                        if table_assertions:
-                            user_found = self._validate_user_fields(response_data, table_assertions)
-                            if not user_found:
-                                missing_fields = ', '.join([f"{k}={v}" for k, v in table_assertions.items()])
-                                validation_errors.append(f"User with fields ({missing_fields}) not found in response")
-                            else:
-                                for key, value in table_assertions.items():
-                                    extracted_values[f"validated_{key}"] = value
+                    elif kind == 'fields':
+                        user_found = self._validate_user_fields(response_data, arg)
+                        if not user_found:
+                            missing_fields = ', '.join([f"{k}={v}" for k, v in arg.items()])
+                            validation_errors.append(f"User with fields ({missing_fields}) not found in response")
+                        else:
+                            for key, value in arg.items():
+                                extracted_values[f"validated_{key}"] = value
                     
-                    # Simple "should contain" checks
-                    if 'should contain' in line_lower and 'following' not in line_lower:
-                        # Extract what should be contained
-                        content_match = re.search(r'should contain.*?"([^"]+)"', line, re.IGNORECASE)
-                        if content_match:
-                            search_value = content_match.group(1)
+                    elif kind == 'contains':
+                        if response_str is None:
                             response_str = json.dumps(response_data)
-                            if search_value not in response_str:
-                                validation_errors.append(f"Response does not contain '{search_value}'")
-                            else:
-                                extracted_values[f"contains_{search_value.replace(' ', '_')}"] = True
-                    
-                    i += 1
+                        if arg not in response_str:
+                            validation_errors.append(f"Response does not contain '{arg}'")
+                        else:
+                            extracted_values[f"contains_{arg.replace(' ', '_')}"] = True
                 
                 success = len(validation_errors) == 0 and status_ok
+                execution_time = time.perf_counter() - start_time
                 
                 # Create result with the correct TestResult structure
                 result = TestResult(
@@ -742,46 +1008,25 @@ Did the UI validation succeed?"""
                     scenario_name=scenario_name,
                     timestamp=datetime.now().isoformat(),
                     api_response={
-                        'status_code': response.status_code,
+                        'status_code': status_code,
                         'response_time_ms': response_time_ms,
                         'data': response_data
                     },
                     extracted_values=extracted_values,
                     errors=validation_errors if validation_errors else None,
-                    execution_time=time.time() - start_time
+                    execution_time=execution_time
                 )
                 
                 # Store result
                 self.test_results.append(result)
                 
                 # Convert to the expected format with all fields
-                from dataclasses import dataclass
-                from enum import Enum
-                
-                @dataclass
-                class FormattedTestResult:
-                    status: Any
-                    execution_time: float
-                    timestamp: datetime
-                    api_endpoint: str
-                    status_code: int
-                    response_time_ms: float
-                    extracted_values: Dict[str, Any]
-                    validation_errors: List[str]
-                    message: str
-                    response_data: Any  # Full response data
-                
-                class Status(Enum):
-                    PASSED = "passed"
-                    FAILED = "failed"
-                    SKIPPED = "skipped"
-                
                 formatted_result = FormattedTestResult(
-                    status=Status.PASSED if success else Status.FAILED,
-                    execution_time=time.time() - start_time,
+                    status=TestStatus.PASSED if success else TestStatus.FAILED,
+                    execution_time=execution_time,
                     timestamp=datetime.now(),
                     api_endpoint=api_url,
-                    status_code=response.status_code,
+                    status_code=status_code,
                     response_time_ms=response_time_ms,
                     extracted_values=extracted_values,
                     validation_errors=validation_errors,
@@ -791,13 +1036,13 @@ Did the UI validation succeed?"""
                 
                 return formatted_result
                 
-            except requests.RequestException as e:
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
                 return TestResult(
                     success=False,
                     scenario_name=scenario_name,
                     timestamp=datetime.now().isoformat(),
                     errors=[f"API request failed: {str(e)}"],
-                    execution_time=time.time() - start_time
+                    execution_time=time.perf_counter() - start_time
                 )
         
         except Exception as e:
@@ -806,5 +1051,14 @@ Did the UI validation succeed?"""
                 scenario_name="Error",
                 timestamp=datetime.now().isoformat(),
                 errors=[f"Execution error: {str(e)}"],
-                execution_time=time.time() - start_time
+                execution_time=time.perf_counter() - start_time
             )
+    
+    async def execute_many(self, gherkin_texts: List[str]) -> List[Any]:
+        """
+        Execute several Gherkin scenarios concurrently.
+        Results are returned in the same order as the input scenarios.
+        """
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(self.execute_gherkin_scenario(text)) for text in gherkin_texts]
+        return [task.result() for task in tasks]
@@ -35,7 +35,7 @@ class TestStatus(str, Enum):
     SKIPPED = "skipped"
 
 
-@dataclass
+@dataclass(slots=True)
 class APIEndpoint:
     """API endpoint definition"""
     url: str
@@ -45,7 +45,7 @@ class APIEndpoint:
     optional_params: Optional[List[str]] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ValidationRule:
     """Validation rule for API responses"""
     field_path: str  # JSONPath to field
@@ -54,7 +54,7 @@ class ValidationRule:
     error_message: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ExtractedValue:
     """Value extracted from API response"""
     name: str
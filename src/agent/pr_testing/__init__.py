@@ -6,6 +6,7 @@ from .schemas import (
     TestInstruction,
     TestScenario,
     TestPlan,
+    TestPlanContent,
     TestStepResult,
     TestExecutionResult
 )
@@ -17,6 +18,7 @@ __all__ = [
     'TestInstruction',
     'TestScenario',
     'TestPlan',
+    'TestPlanContent',
     'TestStepResult',
     'TestExecutionResult'
 ]
@@ -4,16 +4,63 @@ Identifies impacted modules, APIs, UI components, and database changes
 """
 import re
 import logging
-from typing import List, Set
+from functools import lru_cache
+from typing import FrozenSet, Optional, Set, Tuple
 from .schemas import PRContext, FileChange
 
 logger = logging.getLogger(__name__)
 
+# Patterns used while extracting names from file paths
+_PATH_SEP_RE = re.compile(r'[/\\]')
+_API_NAME_RE = re.compile(r'/([\w-]+)(?:Controller|Route|Handler|Api|Service|Endpoint)', re.IGNORECASE)
+_MIGRATION_NAME_RE = re.compile(r'(\d+)_(.+)\.(py|sql)')
+
+# Literal extensions and affixes stripped from file names (affixes compared lowercase)
+_API_EXTENSIONS = ('.py', '.js', '.ts', '.tsx', '.jsx')
+_API_SUFFIXES = ('controller', 'route', 'handler', 'api', 'service', 'endpoint')
+_UI_EXTENSIONS = ('.ts', '.tsx', '.jsx', '.vue', '.html', '.css', '.scss', '.less')
+_UI_PREFIXES = ('index', 'component', 'default')
+_UI_SUFFIXES = ('component', 'view', 'page')
+
+
+def _filename(file_path: str) -> str:
+    """Last component of a path using either separator"""
+    return file_path[max(file_path.rfind('/'), file_path.rfind('\\')) + 1:]
+
+
+def _strip_suffix(name: str, suffixes: tuple) -> str:
+    """Remove the first matching case-insensitive suffix from name"""
+    name_lower = name.lower()
+    for suffix in suffixes:
+        if name_lower.endswith(suffix):
+            return name[:-len(suffix)]
+    return name
+
+
+@lru_cache(maxsize=2048)
+def _extract_module(file_path: str) -> str:
+    """Extract module name from file path (cached; many changed files share a module)"""
+    # Remove leading/trailing slashes
+    path = file_path.strip('/\\')
+
+    # Look for src/ or app/ directories
+    for prefix in ['src/', 'app/', 'lib/', 'packages/']:
+        if prefix in path.lower():
+            parts = path.split(prefix, 1)[1].split('/')[0].split('\\')[0]
+            return parts
+
+    # Fallback: get first directory
+    parts = _PATH_SEP_RE.split(path)
+    if len(parts) > 1:
+        return parts[0]
+
+    return ""
+
 
 class CodeAnalyzer:
     """Analyzes PR changes to identify impacted areas"""
     
-    # File patterns for different impact types
+    # File patterns for different impact types, searched in the lowercased path
     API_PATTERNS = [
         r'api[/\\]', r'endpoint[/\\]', r'route[/\\]', r'controller[/\\]',
         r'service[/\\]', r'handler[/\\]', r'views?\.py$'
@@ -34,6 +81,8 @@ class CodeAnalyzer:
         r'\.json$', r'\.yaml$', r'\.yml$'
     ]
     
+    _extract_module = staticmethod(_extract_module)
+    
     def analyze_pr_impact(self, pr_context: PRContext) -> PRContext:
         """
         Analyze file changes to identify impacted modules/APIs/UI/Database
@@ -46,107 +95,136 @@ class CodeAnalyzer:
         """
         logger.info(f"Analyzing impact for PR #{pr_context.pr_id} with {len(pr_context.file_changes)} changes")
         
+        modules, apis, ui_components, database_changes = _classify_paths(
+            type(self), tuple(file_change.path for file_change in pr_context.file_changes)
+        )
+        
+        # Update context
+        pr_context.impacted_modules = sorted(modules)
+        pr_context.impacted_apis = sorted(apis)
+        pr_context.impacted_ui_components = sorted(ui_components)
+        pr_context.impacted_database = sorted(database_changes)
+        
+        logger.info(
+            f"Impact analysis complete: {len(modules)} modules, "
+            f"{len(apis)} APIs, {len(ui_components)} UI components, "
+            f"{len(database_changes)} DB changes"
+        )
+        
+        return pr_context
+    
+    def _collect_impacts(self, paths: Tuple[str, ...]) -> Tuple[FrozenSet[str], ...]:
+        """Collect (modules, APIs, UI components, database changes) touched by the given paths"""
         modules: Set[str] = set()
         apis: Set[str] = set()
         ui_components: Set[str] = set()
         database_changes: Set[str] = set()
         
-        for file_change in pr_context.file_changes:
-            path = file_change.path
+        classify = self._pattern_classifier()
+        modules_add = modules.add
+        apis_add = apis.add
+        ui_components_add = ui_components.add
+        database_changes_add = database_changes.add
+        
+        for path in paths:
             path_lower = path.lower()
+            is_api, is_ui, is_database = classify(path_lower)
             
             # Extract module from path
             module = self._extract_module(path)
             if module:
-                modules.add(module)
+                modules_add(module)
             
             # Check for API changes
-            if self._matches_patterns(path_lower, self.API_PATTERNS):
+            if is_api:
                 api_name = self._extract_api_name(path)
                 if api_name:
-                    apis.add(api_name)
+                    apis_add(api_name)
             
             # Check for UI changes
-            if self._matches_patterns(path_lower, self.UI_PATTERNS):
+            if is_ui:
                 component = self._extract_component_name(path)
                 if component:
-                    ui_components.add(component)
+                    ui_components_add(component)
             
             # Check for database changes
-            if self._matches_patterns(path_lower, self.DATABASE_PATTERNS):
-                db_change = self._extract_database_change(path)
+            if is_database:
+                db_change = self._extract_database_change(path, path_lower)
                 if db_change:
-                    database_changes.add(db_change)
+                    database_changes_add(db_change)
         
-        # Update context
-        pr_context.impacted_modules = sorted(list(modules))
-        pr_context.impacted_apis = sorted(list(apis))
-        pr_context.impacted_ui_components = sorted(list(ui_components))
-        pr_context.impacted_database = sorted(list(database_changes))
-        
-        logger.info(
-            f"Impact analysis complete: {len(modules)} modules, "
-            f"{len(apis)} APIs, {len(ui_components)} UI components, "
-            f"{len(database_changes)} DB changes"
-        )
-        
-        return pr_context
+        return frozenset(modules), frozenset(apis), frozenset(ui_components), frozenset(database_changes)
     
-    def _extract_module(self, file_path: str) -> str:
-        """Extract module name from file path"""
-        # Remove leading/trailing slashes
-        path = file_path.strip('/\\')
-        
-        # Look for src/ or app/ directories
-        for prefix in ['src/', 'app/', 'lib/', 'packages/']:
-            if prefix in path.lower():
-                parts = path.split(prefix, 1)[1].split('/')[0].split('\\')[0]
-                return parts
-        
-        # Fallback: get first directory
-        parts = re.split(r'[/\\]', path)
-        if len(parts) > 1:
-            return parts[0]
-        
-        return ""
+    def _pattern_classifier(self):
+        """
+        Return the (API, UI, database) classifier for this analyzer: the fast _classify when the
+        pattern lists are the defaults, otherwise fused regexes built from the overridden lists
+        """
+        patterns = (tuple(self.API_PATTERNS), tuple(self.UI_PATTERNS), tuple(self.DATABASE_PATTERNS))
+        if patterns == _DEFAULT_PATTERNS:
+            return self._classify
+        return _regex_classifier(*patterns)
+    
+    @staticmethod
+    def _classify(path_lower: str) -> Tuple[bool, bool, bool]:
+        """
+        Classify a lowercased path as (API, UI, database) in one pass using plain
+        substring/suffix tests equivalent to API_PATTERNS, UI_PATTERNS and DATABASE_PATTERNS
+        """
+        path = path_lower.replace('\\', '/')
+        is_api = (
+            'api/' in path or 'endpoint/' in path or 'route/' in path or 'controller/' in path
+            or 'service/' in path or 'handler/' in path or path.endswith(('view.py', 'views.py'))
+        )
+        is_ui = path.endswith(_UI_EXTENSIONS) or 'component/' in path
+        is_database = (
+            'migration/' in path or 'schema/' in path or 'database/' in path or 'alembic/' in path
+            or path.endswith(('model.py', 'models.py', '.sql'))
+        )
+        return is_api, is_ui, is_database
     
     def _extract_api_name(self, file_path: str) -> str:
         """Extract API endpoint name from file path"""
         # Try to find controller/route/handler name
-        match = re.search(r'/([\w-]+)(?:Controller|Route|Handler|Api|Service|Endpoint)', file_path, re.IGNORECASE)
+        match = _API_NAME_RE.search(file_path)
         if match:
             return match.group(1)
         
         # Fallback: use filename without extension
-        filename = file_path.split('/')[-1].split('\\')[-1]
-        name = re.sub(r'\.(py|js|ts|tsx|jsx)$', '', filename)
+        filename = _filename(file_path)
+        name = filename.rsplit('.', 1)[0] if filename.endswith(_API_EXTENSIONS) else filename
         
         # Clean up common suffixes
-        name = re.sub(r'(Controller|Route|Handler|Api|Service|Endpoint)$', '', name, flags=re.IGNORECASE)
+        name = _strip_suffix(name, _API_SUFFIXES)
         
         return name if name else ""
     
     def _extract_component_name(self, file_path: str) -> str:
         """Extract UI component name from file path"""
         # Get filename without extension
-        filename = file_path.split('/')[-1].split('\\')[-1]
-        name = re.sub(r'\.(tsx?|jsx|vue|html|css|scss|less)$', '', filename)
+        filename = _filename(file_path)
+        name = filename.rsplit('.', 1)[0] if filename.endswith(_UI_EXTENSIONS) else filename
         
         # Clean up common prefixes/suffixes
-        name = re.sub(r'^(index|component|default)', '', name, flags=re.IGNORECASE)
-        name = re.sub(r'(Component|View|Page)$', '', name, flags=re.IGNORECASE)
+        name_lower = name.lower()
+        for prefix in _UI_PREFIXES:
+            if name_lower.startswith(prefix):
+                name = name[len(prefix):]
+                break
+        name = _strip_suffix(name, _UI_SUFFIXES)
         
         return name.strip() if name.strip() else filename
     
-    def _extract_database_change(self, file_path: str) -> str:
+    def _extract_database_change(self, file_path: str, path_lower: Optional[str] = None) -> str:
         """Extract database change description from file path"""
-        path_lower = file_path.lower()
+        if path_lower is None:
+            path_lower = file_path.lower()
         
         # Check if it's a migration file
         if 'migration' in path_lower:
-            filename = file_path.split('/')[-1].split('\\')[-1]
+            filename = _filename(file_path)
             # Try to extract migration name
-            match = re.search(r'(\d+)_(.+)\.(py|sql)', filename)
+            match = _MIGRATION_NAME_RE.search(filename)
             if match:
                 return f"Migration: {match.group(2).replace('_', ' ')}"
             return f"Migration: {filename}"
@@ -161,10 +239,6 @@ class CodeAnalyzer:
         
         return f"Database: {file_path.split('/')[-1]}"
     
-    def _matches_patterns(self, path: str, patterns: List[str]) -> bool:
-        """Check if path matches any of the given patterns"""
-        return any(re.search(pattern, path) for pattern in patterns)
-    
     def get_impact_summary(self, pr_context: PRContext) -> str:
         """Generate human-readable impact summary"""
         summary_parts = []
@@ -185,3 +259,33 @@ class CodeAnalyzer:
             return "No significant impacts detected"
         
         return "Impacts: " + ", ".join(summary_parts)
+
+
+_DEFAULT_PATTERNS = (
+    tuple(CodeAnalyzer.API_PATTERNS), tuple(CodeAnalyzer.UI_PATTERNS), tuple(CodeAnalyzer.DATABASE_PATTERNS)
+)
+
+
+@lru_cache(maxsize=32)
+def _regex_classifier(api_patterns: Tuple[str, ...], ui_patterns: Tuple[str, ...],
+                      database_patterns: Tuple[str, ...]):
+    """Fuse each pattern list into one compiled alternation and classify with a search per list"""
+    api_re, ui_re, database_re = (
+        re.compile('|'.join(f'(?:{pattern})' for pattern in patterns)) if patterns else None
+        for patterns in (api_patterns, ui_patterns, database_patterns)
+    )
+    
+    def classify(path_lower: str) -> Tuple[bool, bool, bool]:
+        return (
+            api_re is not None and api_re.search(path_lower) is not None,
+            ui_re is not None and ui_re.search(path_lower) is not None,
+            database_re is not None and database_re.search(path_lower) is not None,
+        )
+    
+    return classify
+
+
+@lru_cache(maxsize=512)
+def _classify_paths(analyzer_cls: type, paths: Tuple[str, ...]) -> Tuple[FrozenSet[str], ...]:
+    """Impact analysis is deterministic in the changed paths, so re-analyzing a PR is a cache hit"""
+    return analyzer_cls()._collect_impacts(paths)
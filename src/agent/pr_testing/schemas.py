@@ -64,10 +64,9 @@ class TestScenario(BaseModel):
     test_type: str = "functional"  # functional, integration, regression, smoke
 
 
-class TestPlan(BaseModel):
-    """Complete test plan generated by AI"""
-    pr_id: int
-    summary: str
+class TestPlanContent(BaseModel):
+    """Test plan fields the LLM fills in via structured output (pr_id is added by the caller)"""
+    summary: str = Field(description="Brief 1-2 sentence overview of what needs testing")
     test_scenarios: List[TestScenario] = []
     manual_steps: List[TestInstruction] = []
     automated_steps: List[TestInstruction] = []
@@ -75,6 +74,11 @@ class TestPlan(BaseModel):
     test_data_requirements: List[str] = []
 
 
+class TestPlan(TestPlanContent):
+    """Complete test plan generated by AI"""
+    pr_id: int
+
+
 class TestStepResult(BaseModel):
     """Result of a single test step execution"""
     step_number: int
@@ -2,15 +2,173 @@
 Azure DevOps REST API Client for PR Testing Automation
 Handles authentication and API calls to Azure DevOps Services
 """
-import aiohttp
 import asyncio
+import httpx
+import orjson
 import base64
 import logging
-from typing import List, Dict, Any, Optional
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
 from urllib.parse import quote
 
+from src.utils.http_client import CachePolicy, ResponseCache, TokenBucket, get_client
+
 logger = logging.getLogger(__name__)
 
+# Seconds each kind of GET response is served from cache; None = immutable
+_TTL_PULL_REQUESTS = 30
+_TTL_PR_DETAILS = 30
+_TTL_WORK_ITEM = 300
+_TTL_FILE_CONTENT = None  # content at a given commit never changes
+_TTL_PROJECTS = 3600
+_TTL_REPOSITORIES = 3600
+_TTL_NOT_FOUND = 600  # missing files at a commit and deleted work items stay missing
+
+# Only fetch essential work item fields for speed (instead of $expand=all)
+_WORK_ITEM_FIELDS = (
+    "System.Id",
+    "System.WorkItemType",
+    "System.Title",
+    "System.State",
+    "System.Description",
+    "Microsoft.VSTS.Common.AcceptanceCriteria",
+    "Microsoft.VSTS.TCM.ReproSteps"
+)
+
+# Maximum IDs accepted by one workitemsbatch request
+_WORK_ITEM_BATCH_SIZE = 200
+
+# Outbound request budget per organization, kept under Azure DevOps throttling (TSTU) limits
+_REQUESTS_PER_MINUTE = 200
+_MAX_ATTEMPTS = 3
+_MAX_RETRY_AFTER = 30.0
+
+_rate_limiters: Dict[str, TokenBucket] = {}
+
+
+@lru_cache(maxsize=8)
+def _basic_auth_header(pat: str) -> str:
+    """Encode PAT for Basic authentication (cached, the UI reuses the same PAT)"""
+    return f"Basic {base64.b64encode(f':{pat}'.encode()).decode()}"
+
+
+@lru_cache(maxsize=8)
+def _pat_headers(pat: str) -> Dict[str, str]:
+    """Request headers for organization-level calls made without a client instance (read-only)"""
+    return {
+        "Authorization": _basic_auth_header(pat),
+        "Accept": "application/json"
+    }
+
+
+@asynccontextmanager
+async def _open(
+    organization: str,
+    method: str,
+    url: str,
+    headers: Dict[str, str],
+    params: Optional[Dict[str, Any]] = None,
+    json: Optional[Any] = None
+) -> AsyncIterator[httpx.Response]:
+    """
+    Send a rate-limited request through the shared client and yield the successful response
+    with its body not yet read; 429 responses are retried after Retry-After, other error
+    statuses raise HTTPStatusError
+    """
+    bucket = _rate_limiters.get(organization)
+    if bucket is None:
+        bucket = _rate_limiters[organization] = TokenBucket(_REQUESTS_PER_MINUTE)
+    
+    client = await get_client()
+    for attempt in range(_MAX_ATTEMPTS):
+        await bucket.acquire()
+        async with client.stream(method, url, headers=headers, params=params, json=json) as resp:
+            if resp.status_code == 429 and attempt < _MAX_ATTEMPTS - 1:
+                try:
+                    delay = float(resp.headers.get("Retry-After", 1))
+                except ValueError:
+                    delay = 1.0
+                delay = min(max(delay, 0.0), _MAX_RETRY_AFTER)
+                logger.warning(f"Throttled by Azure DevOps, retrying {url} in {delay:.1f}s")
+                await bucket.refund()
+            else:
+                resp.raise_for_status()
+                yield resp
+                return
+        await asyncio.sleep(delay)
+
+
+async def _request(
+    organization: str,
+    method: str,
+    url: str,
+    headers: Dict[str, str],
+    params: Optional[Dict[str, Any]] = None,
+    json: Optional[Any] = None,
+    as_text: bool = False
+) -> Any:
+    """Send a rate-limited request and return the decoded JSON (or text) body"""
+    async with _open(organization, method, url, headers, params=params, json=json) as resp:
+        body = await resp.aread()
+        if as_text:
+            return resp.text
+        return orjson.loads(body) if body.strip() else None
+
+
+async def _get_cached_value(organization: str, url: str, pat: str, ttl: Optional[float]) -> List[Any]:
+    """GET a collection with PAT auth through the response cache and return its "value" list"""
+    headers = _pat_headers(pat)
+    key = ResponseCache.make_key("GET", url, None, headers["Authorization"])
+    return await _response_cache.get_or_fetch(
+        key, ttl, lambda: _request_value(organization, "GET", url, headers)
+    )
+
+
+async def _request_value(
+    organization: str,
+    method: str,
+    url: str,
+    headers: Dict[str, str],
+    params: Optional[Dict[str, Any]] = None,
+    json: Optional[Any] = None
+) -> List[Any]:
+    """Send a rate-limited request and return the "value" list of the collection response"""
+    data = await _request(organization, method, url, headers, params=params, json=json)
+    return data.get("value", []) if data else []
+
+# Shared across client instances since the UI builds a new client per action
+_response_cache = ResponseCache(
+    max_entries=1000,
+    policy=CachePolicy.from_env("AZURE_DEVOPS_CACHE_POLICY")
+)
+
+
+@dataclass(slots=True, frozen=True)
+class PullRequestSummary:
+    """Pull request fields shown in PR lists"""
+    id: int
+    title: str
+    author: str
+    status: str
+    source_branch: str
+    target_branch: str
+    creation_date: str
+    
+    @classmethod
+    def from_api(cls, pr: Dict[str, Any]) -> "PullRequestSummary":
+        """Build from a pull request object returned by the REST API"""
+        return cls(
+            id=pr["pullRequestId"],
+            title=pr["title"],
+            author=pr["createdBy"]["displayName"],
+            status=pr["status"],
+            source_branch=pr["sourceRefName"].replace("refs/heads/", ""),
+            target_branch=pr["targetRefName"].replace("refs/heads/", ""),
+            creation_date=pr["creationDate"]
+        )
+
 
 class AzureDevOpsClient:
     """Async client for Azure DevOps REST API v7.0"""
@@ -31,16 +189,15 @@ class AzureDevOpsClient:
         # URL encode project name to handle spaces (e.g., "TPS Cloud" -> "TPS%20Cloud")
         project_encoded = quote(project, safe='')
         self.base_url = f"https://dev.azure.com/{organization}/{project_encoded}/_apis"
+        # Work items use an organization-level URL
+        self.org_url = f"https://dev.azure.com/{organization}/_apis"
+        # No Content-Type here: GETs have no body, and httpx sets it for JSON request bodies.
+        # Accept-Encoding is left to httpx, which advertises every decoder it has installed
         self.headers = {
-            "Authorization": f"Basic {self._encode_pat(pat)}",
-            "Content-Type": "application/json",
+            "Authorization": _basic_auth_header(pat),
             "Accept": "application/json"
         }
     
-    def _encode_pat(self, pat: str) -> str:
-        """Encode PAT for Basic authentication"""
-        return base64.b64encode(f":{pat}".encode()).decode()
-    
     async def list_pull_requests(self, branch: Optional[str] = None, status: str = "all") -> List[Dict[str, Any]]:
         """
         Fetch all PRs for a repository
@@ -62,19 +219,36 @@ class AzureDevOpsClient:
             if branch:
                 params["searchCriteria.targetRefName"] = f"refs/heads/{branch}"
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=self.headers, params=params) as resp:
-                    resp.raise_for_status()
-                    data = await resp.json()
-                    logger.info(f"Fetched {len(data.get('value', []))} pull requests")
-                    return data.get("value", [])
-        except aiohttp.ClientError as e:
+            async def fetch():
+                prs = await _request_value(self.organization, "GET", url, self.headers, params=params)
+                logger.info(f"Fetched {len(prs)} pull requests")
+                return prs
+            
+            key = ResponseCache.make_key("GET", url, params, self.headers["Authorization"])
+            return await _response_cache.get_or_fetch(key, _TTL_PULL_REQUESTS, fetch)
+        except httpx.HTTPError as e:
             logger.error(f"Failed to fetch pull requests: {e}")
             raise Exception(f"Azure DevOps API error: {str(e)}")
         except Exception as e:
             logger.error(f"Unexpected error fetching PRs: {e}")
             raise
     
+    async def list_pull_request_summaries(
+        self, branch: Optional[str] = None, status: str = "all"
+    ) -> List[PullRequestSummary]:
+        """
+        Fetch all PRs for a repository as typed summaries
+        
+        Args:
+            branch: Optional target branch filter (e.g., "main", "develop")
+            status: PR status filter ("active", "completed", "abandoned", "all")
+        
+        Returns:
+            List of pull request summaries
+        """
+        prs = await self.list_pull_requests(branch, status)
+        return [PullRequestSummary.from_api(pr) for pr in prs]
+    
     async def get_pr_details(self, pr_id: int) -> Dict[str, Any]:
         """
         Get detailed PR information including commits, changes, and work items
@@ -87,51 +261,78 @@ class AzureDevOpsClient:
         """
         try:
             pr_url = f"{self.base_url}/git/repositories/{self.repository}/pullrequests/{pr_id}"
-            commits_url = f"{pr_url}/commits"
-            iterations_url = f"{pr_url}/iterations"
-            workitems_url = f"{pr_url}/workitems"
-            
-            async with aiohttp.ClientSession() as session:
-                # Fetch all data in parallel
-                pr_data, commits_data, iterations_data, workitems_data = await asyncio.gather(
-                    self._fetch_json(session, pr_url),
-                    self._fetch_json(session, commits_url),
-                    self._fetch_json(session, iterations_url),
-                    self._fetch_json(session, workitems_url),
-                    return_exceptions=True
-                )
-                
-                # Handle potential errors
-                if isinstance(pr_data, Exception):
-                    raise pr_data
-                
-                commits = commits_data.get("value", []) if not isinstance(commits_data, Exception) else []
-                iterations = iterations_data.get("value", []) if not isinstance(iterations_data, Exception) else []
-                workitems = workitems_data.get("value", []) if not isinstance(workitems_data, Exception) else []
-                
-                # Get file changes from latest iteration (must be inside session context)
-                changes = []
-                if iterations:
-                    try:
-                        latest_iteration_id = iterations[-1].get("id", 1)
-                        changes_url = f"{pr_url}/iterations/{latest_iteration_id}/changes"
-                        changes_data = await self._fetch_json(session, changes_url)
-                        changes = changes_data.get("changeEntries", [])
-                    except Exception as e:
-                        logger.warning(f"Failed to fetch changes for PR #{pr_id}: {e}")
-                        changes = []
-                
-                logger.info(f"Fetched PR #{pr_id} details: {len(commits)} commits, {len(changes)} changes")
-                
-                return {
-                    "pr": pr_data,
-                    "commits": commits,
-                    "changes": changes,
-                    "workitems": workitems
-                }
+            key = ResponseCache.make_key("GET", pr_url, None, self.headers["Authorization"])
+            return await _response_cache.get_or_fetch(
+                key, _TTL_PR_DETAILS, lambda: self._fetch_pr_details(pr_url, pr_id)
+            )
         except Exception as e:
             logger.error(f"Failed to fetch PR details for #{pr_id}: {e}")
-            raise Exception(f"Failed to fetch PR details: {str(e)}")
+            raise
+    
+    async def _fetch_pr_details(self, pr_url: str, pr_id: int) -> Dict[str, Any]:
+        """Fetch PR data, commits, latest changes and work item refs in parallel"""
+        commits_url = f"{pr_url}/commits"
+        workitems_url = f"{pr_url}/workitems"
+        
+        # Fetch all data in parallel; the latest iteration's changes are requested as soon
+        # as the iteration list arrives, while the other calls are still in flight.
+        # Side fetches degrade to empty lists, so only a failed PR fetch aborts the group,
+        # which cancels whatever is still pending
+        try:
+            async with asyncio.TaskGroup() as tg:
+                pr_task = tg.create_task(self._fetch_json(pr_url))
+                commits_task = tg.create_task(self._fetch_value_or_empty(commits_url))
+                workitems_task = tg.create_task(self._fetch_value_or_empty(workitems_url))
+                changes_task = tg.create_task(self._fetch_latest_changes(pr_url, pr_id))
+        except* Exception as eg:
+            # Surface the first failure for callers matching on its type, but keep the
+            # whole group (every failed fetch) as its cause
+            first = eg
+            while isinstance(first, BaseExceptionGroup):
+                first = first.exceptions[0]
+            raise first from eg
+        
+        pr_data = pr_task.result()
+        commits = commits_task.result()
+        workitems = workitems_task.result()
+        changes = changes_task.result()
+        
+        logger.info(f"Fetched PR #{pr_id} details: {len(commits)} commits, {len(changes)} changes")
+        
+        return {
+            "pr": pr_data,
+            "commits": commits,
+            "changes": changes,
+            "workitems": workitems
+        }
+    
+    async def _fetch_value_or_empty(self, url: str) -> List[Any]:
+        """Fetch a collection's "value" list, or an empty list if the request fails"""
+        try:
+            data = await self._fetch_json(url)
+        except Exception:
+            return []
+        return data.get("value", []) if data else []
+    
+    async def _fetch_latest_changes(self, pr_url: str, pr_id: int) -> List[Dict[str, Any]]:
+        """Fetch file changes from the PR's latest iteration"""
+        try:
+            iterations_data = await self._fetch_json(f"{pr_url}/iterations")
+        except Exception:
+            return []
+        
+        iterations = iterations_data.get("value", [])
+        if not iterations:
+            return []
+        
+        try:
+            latest_iteration_id = iterations[-1].get("id", 1)
+            changes_url = f"{pr_url}/iterations/{latest_iteration_id}/changes"
+            changes_data = await self._fetch_json(changes_url)
+            return changes_data.get("changeEntries", [])
+        except Exception as e:
+            logger.warning(f"Failed to fetch changes for PR #{pr_id}: {e}")
+            return []
     
     async def get_file_content(self, file_path: str, commit_id: str) -> str:
         """
@@ -145,22 +346,53 @@ class AzureDevOpsClient:
             File content as string
         """
         try:
-            url = f"{self.base_url}/git/repositories/{self.repository}/items"
-            params = {
-                "api-version": "7.0",
-                "path": file_path,
-                "versionDescriptor.version": commit_id,
-                "versionDescriptor.versionType": "commit"
-            }
+            url, params = self._item_request(file_path, commit_id)
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=self.headers, params=params) as resp:
-                    resp.raise_for_status()
-                    return await resp.text()
+            async def fetch():
+                return await _request(self.organization, "GET", url, self.headers, params=params, as_text=True)
+            
+            key = ResponseCache.make_key("GET", url, params, self.headers["Authorization"])
+            return await _response_cache.get_or_fetch(
+                key, _TTL_FILE_CONTENT, fetch, not_found="", not_found_ttl=_TTL_NOT_FOUND
+            )
         except Exception as e:
             logger.error(f"Failed to fetch file content for {file_path}: {e}")
             return ""
     
+    async def stream_file_content(
+        self, file_path: str, commit_id: str, chunk_size: int = 65536
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream raw file content at a specific commit without holding the whole file in memory
+        Unlike get_file_content this isn't cached and request errors propagate
+        
+        Callers that may stop early should iterate inside contextlib.aclosing(...); otherwise
+        the HTTP response stays open until the generator is garbage collected
+        
+        Args:
+            file_path: Path to file in repository
+            commit_id: Commit SHA
+            chunk_size: Maximum bytes per yielded chunk
+        
+        Yields:
+            Chunks of the (already decompressed) file bytes
+        """
+        url, params = self._item_request(file_path, commit_id)
+        async with _open(self.organization, "GET", url, self.headers, params=params) as resp:
+            async for chunk in resp.aiter_bytes(chunk_size):
+                yield chunk
+    
+    def _item_request(self, file_path: str, commit_id: str) -> Tuple[str, Dict[str, str]]:
+        """URL and query params for a file at a specific commit"""
+        url = f"{self.base_url}/git/repositories/{self.repository}/items"
+        params = {
+            "api-version": "7.0",
+            "path": file_path,
+            "versionDescriptor.version": commit_id,
+            "versionDescriptor.versionType": "commit"
+        }
+        return url, params
+    
     async def post_pr_comment(self, pr_id: int, comment: str, status: str = "active") -> Dict[str, Any]:
         """
         Post a comment thread to PR
@@ -186,16 +418,15 @@ class AzureDevOpsClient:
                 "status": status
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    url + "?api-version=7.0", 
-                    headers=self.headers, 
-                    json=payload
-                ) as resp:
-                    resp.raise_for_status()
-                    result = await resp.json()
-                    logger.info(f"Posted comment to PR #{pr_id}")
-                    return result
+            result = await _request(
+                self.organization,
+                "POST",
+                url + "?api-version=7.0",
+                self.headers,
+                json=payload
+            )
+            logger.info(f"Posted comment to PR #{pr_id}")
+            return result
         except Exception as e:
             logger.error(f"Failed to post comment to PR #{pr_id}: {e}")
             raise Exception(f"Failed to post PR comment: {str(e)}")
@@ -211,42 +442,67 @@ class AzureDevOpsClient:
         Returns:
             Dictionary with work item details including fields, description, acceptance criteria
         """
-        try:
-            # Work items use a different base URL pattern
-            work_item_url = f"https://dev.azure.com/{self.organization}/_apis/wit/workitems/{work_item_id}"
-            
-            # Only fetch essential fields for speed (instead of $expand=all)
-            essential_fields = [
-                "System.Id",
-                "System.WorkItemType", 
-                "System.Title",
-                "System.State",
-                "System.Description",
-                "Microsoft.VSTS.Common.AcceptanceCriteria",
-                "Microsoft.VSTS.TCM.ReproSteps"
-            ]
-            
-            params = {
-                "api-version": "7.0",
-                "fields": ",".join(essential_fields)
-            }
+        work_items = await self.get_work_items_batch([work_item_id])
+        return work_items[0] if work_items else {}
+    
+    async def get_work_items_batch(self, work_item_ids: List[int]) -> List[Dict[str, Any]]:
+        """
+        Fetch several work items with one workitemsbatch request per 200 IDs
+        Only fetches essential fields for faster performance
+        
+        Args:
+            work_item_ids: Work item IDs
+        
+        Returns:
+            Work item dictionaries in request order; missing or deleted items are omitted
+        """
+        # IDs omitted by an earlier batch are remembered individually, so a deleted work item
+        # isn't requested again when it turns up alongside different IDs
+        use_cache = _response_cache.policy is not CachePolicy.DISABLED
+        auth = self.headers["Authorization"]
+        
+        def not_found_key(work_item_id: int) -> str:
+            return ResponseCache.make_key("GET", f"{self.org_url}/wit/workitems/{work_item_id}", None, auth)
+        
+        if use_cache:
+            work_item_ids = [i for i in work_item_ids if not _response_cache.get(not_found_key(i))[0]]
+        if not work_item_ids:
+            return []
+        
+        url = f"{self.org_url}/wit/workitemsbatch?api-version=7.0"
+        chunks = [
+            list(work_item_ids[i:i + _WORK_ITEM_BATCH_SIZE])
+            for i in range(0, len(work_item_ids), _WORK_ITEM_BATCH_SIZE)
+        ]
+        
+        async def fetch_chunk(ids: List[int]) -> List[Dict[str, Any]]:
+            async def fetch():
+                payload = {"ids": ids, "fields": list(_WORK_ITEM_FIELDS), "errorPolicy": "omit"}
+                values = await _request_value(self.organization, "POST", url, self.headers, json=payload)
+                # With errorPolicy=omit, items that can't be read come back as null
+                work_items = [wi for wi in values if wi]
+                logger.info(f"Fetched {len(work_items)}/{len(ids)} work item details")
+                if use_cache:
+                    found = {wi.get("id") for wi in work_items}
+                    for work_item_id in ids:
+                        if work_item_id not in found:
+                            _response_cache.set(not_found_key(work_item_id), True, _TTL_NOT_FOUND)
+                return work_items
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(work_item_url, headers=self.headers, params=params) as resp:
-                    resp.raise_for_status()
-                    data = await resp.json()
-                    logger.info(f"Fetched work item #{work_item_id} details")
-                    return data
+            key = ResponseCache.make_key("POST", url, {"ids": ids}, self.headers["Authorization"])
+            return await _response_cache.get_or_fetch(key, _TTL_WORK_ITEM, fetch)
+        
+        try:
+            results = await asyncio.gather(*(fetch_chunk(ids) for ids in chunks))
+            return [wi for chunk in results for wi in chunk]
         except Exception as e:
-            logger.error(f"Failed to fetch work item #{work_item_id}: {e}")
-            return {}
+            logger.error(f"Failed to fetch work items {list(work_item_ids)}: {e}")
+            return []
     
-    async def _fetch_json(self, session: aiohttp.ClientSession, url: str) -> Dict[str, Any]:
+    async def _fetch_json(self, url: str) -> Dict[str, Any]:
         """Helper method to fetch JSON data"""
         try:
-            async with session.get(url + "?api-version=7.0", headers=self.headers) as resp:
-                resp.raise_for_status()
-                return await resp.json()
+            return await _request(self.organization, "GET", url + "?api-version=7.0", self.headers)
         except Exception as e:
             logger.error(f"Failed to fetch {url}: {e}")
             raise
@@ -265,18 +521,9 @@ class AzureDevOpsClient:
         """
         try:
             url = f"https://dev.azure.com/{organization}/_apis/projects?api-version=7.0"
-            headers = {
-                "Authorization": f"Basic {base64.b64encode(f':{pat}'.encode()).decode()}",
-                "Content-Type": "application/json"
-            }
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers) as resp:
-                    resp.raise_for_status()
-                    data = await resp.json()
-                    projects = data.get("value", [])
-                    logger.info(f"Fetched {len(projects)} projects from {organization}")
-                    return projects
+            projects = await _get_cached_value(organization, url, pat, _TTL_PROJECTS)
+            logger.info(f"Fetched {len(projects)} projects from {organization}")
+            return projects
         except Exception as e:
             logger.error(f"Failed to fetch projects: {e}")
             raise Exception(f"Failed to fetch projects: {str(e)}")
@@ -297,18 +544,9 @@ class AzureDevOpsClient:
         try:
             project_encoded = quote(project, safe='')
             url = f"https://dev.azure.com/{organization}/{project_encoded}/_apis/git/repositories?api-version=7.0"
-            headers = {
-                "Authorization": f"Basic {base64.b64encode(f':{pat}'.encode()).decode()}",
-                "Content-Type": "application/json"
-            }
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers) as resp:
-                    resp.raise_for_status()
-                    data = await resp.json()
-                    repos = data.get("value", [])
-                    logger.info(f"Fetched {len(repos)} repositories from {project}")
-                    return repos
+            repos = await _get_cached_value(organization, url, pat, _TTL_REPOSITORIES)
+            logger.info(f"Fetched {len(repos)} repositories from {project}")
+            return repos
         except Exception as e:
             logger.error(f"Failed to fetch repositories: {e}")
             raise Exception(f"Failed to fetch repositories: {str(e)}")
@@ -0,0 +1,213 @@
+"""
+Shared HTTP client and response cache for outbound REST calls
+Keeps TCP/TLS connections and DNS lookups alive across requests to the same host, and
+multiplexes concurrent requests over one HTTP/2 connection where the server supports it
+"""
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from enum import Enum
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
+
+import httpx
+
+try:
+    import h2  # noqa: F401  (enables httpx HTTP/2 support)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+async def get_client() -> httpx.AsyncClient:
+    """
+    Get the process-wide pooled client, creating it on first use inside the running loop
+
+    Auth headers are not set on the client; callers pass them per request since they
+    vary by PAT. A client created on a loop that has since gone away is replaced.
+    """
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            timeout=httpx.Timeout(60.0, connect=10.0)
+        )
+        _client_loop = loop
+    return _client
+
+
+async def close_client():
+    """Close the shared client if it was opened on the running loop"""
+    global _client, _client_loop
+    if _client is not None and not _client.is_closed and _client_loop is asyncio.get_running_loop():
+        await _client.aclose()
+    _client = None
+    _client_loop = None
+
+
+@asynccontextmanager
+async def client_lifespan(app: Any) -> AsyncIterator[None]:
+    """
+    ASGI lifespan closing the shared client when the server shuts down
+
+    Runs on the server's event loop, the same loop request handlers created the client on.
+    Pass as launch(app_kwargs={"lifespan": client_lifespan}) for a Gradio app.
+    """
+    try:
+        yield
+    finally:
+        await close_client()
+
+
+class TokenBucket:
+    """Token bucket smoothing outbound requests to at most rpm per minute, with bursts up to capacity"""
+
+    def __init__(self, rpm: float, capacity: Optional[float] = None):
+        self.rpm = rpm
+        self.capacity = capacity if capacity is not None else rpm
+        self.tokens = self.capacity
+        self.last_update = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_update) * self.rpm / 60)
+        self.last_update = now
+
+    async def acquire(self, tokens: float = 1):
+        """Wait until tokens are available and take them"""
+        while True:
+            async with self._lock:
+                self._refill()
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                wait = (tokens - self.tokens) * 60 / self.rpm
+            # Sleep outside the lock so refunds and other callers are not blocked meanwhile
+            await asyncio.sleep(wait)
+
+    async def refund(self, tokens: float = 1):
+        """Return tokens for a request the server rejected without doing work (e.g. 429)"""
+        async with self._lock:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens + tokens)
+
+
+# Marks "no not-found value" for get_or_fetch, since None and "" are valid values
+_NO_VALUE = object()
+
+
+class CachePolicy(str, Enum):
+    """How ResponseCache treats lookups and stores"""
+    ENABLED = "enabled"        # read and write
+    DISABLED = "disabled"      # always fetch
+    # Serve hits, raise CacheMissError on a miss. The cache is in-memory only, so this is for
+    # tests that seed it with set(); from_env() never selects it
+    REPLAY = "replay"
+
+    @classmethod
+    def from_env(cls, name: str) -> "CachePolicy":
+        """Read enabled/disabled from an environment variable, falling back to ENABLED on any other value"""
+        raw = os.getenv(name, "").strip().lower()
+        if not raw:
+            return cls.ENABLED
+        if raw in (cls.ENABLED.value, cls.DISABLED.value):
+            return cls(raw)
+        logger.warning(
+            f"Ignoring {name}={raw!r} (expected {cls.ENABLED.value} or {cls.DISABLED.value}); "
+            f"using {cls.ENABLED.value}"
+        )
+        return cls.ENABLED
+
+
+class CacheMissError(LookupError):
+    """Raised in replay mode when a request has no cached response"""
+
+
+class ResponseCache:
+    """In-memory LRU cache of decoded responses (or other fetched results) with per-entry TTL"""
+
+    def __init__(self, max_entries: int = 1000, policy: CachePolicy = CachePolicy.ENABLED):
+        self.max_entries = max_entries
+        self.policy = policy
+        # key -> (expiry on the monotonic clock or None for never, value)
+        self._entries: "OrderedDict[str, Tuple[Optional[float], Any]]" = OrderedDict()
+
+    @staticmethod
+    def make_key(method: str, url: str, params: Optional[Dict[str, Any]] = None, auth: str = "") -> str:
+        """Build the cache key for a request; auth is included so credentials never share entries"""
+        payload = f"{method}|{url}|{sorted((params or {}).items())}|{auth}"
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Return (hit, value) for a key, dropping it if expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def set(self, key: str, value: Any, ttl: Optional[float]):
+        """Store a value for ttl seconds (None keeps it until evicted)"""
+        expires_at = None if ttl is None else time.monotonic() + ttl
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop all entries"""
+        self._entries.clear()
+
+    async def get_or_fetch(
+        self,
+        key: str,
+        ttl: Optional[float],
+        fetch: Callable[[], Awaitable[Any]],
+        not_found: Any = _NO_VALUE,
+        not_found_ttl: float = 600,
+        refresh: bool = False
+    ) -> Any:
+        """
+        Return the cached value for key, or await fetch() and cache its result
+
+        Args:
+            key: Key from make_key()
+            ttl: Seconds the fetched value stays valid; None for immutable resources
+            fetch: Coroutine function performing the request
+            not_found: If given, returned and cached for not_found_ttl seconds when fetch
+                raises a 404 HTTPStatusError; other errors (5xx, 429, ...) are never cached
+            refresh: Skip the lookup and fetch, replacing any cached value (ignored in replay mode)
+        """
+        if self.policy is CachePolicy.DISABLED:
+            return await fetch()
+
+        hit, value = (False, None) if refresh and self.policy is not CachePolicy.REPLAY else self.get(key)
+        if hit:
+            return value
+        if self.policy is CachePolicy.REPLAY:
+            raise CacheMissError(f"No cached response for request {key[:12]}")
+
+        try:
+            value = await fetch()
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code != 404 or not_found is _NO_VALUE:
+                raise
+            logger.info(f"Caching not-found response for {e.request.url}")
+            value, ttl = not_found, not_found_ttl
+        self.set(key, value, ttl)
+        return value
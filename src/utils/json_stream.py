@@ -0,0 +1,69 @@
+"""
+Helpers for pulling the first JSON object out of LLM output, including while it streams
+"""
+from contextlib import aclosing
+from typing import Any, List, Optional
+
+
+class JsonBlockScanner:
+    """Incremental, string-aware brace matcher that locates the first balanced {...} block"""
+    
+    def __init__(self):
+        self.start = -1
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.offset = 0
+    
+    def feed(self, text: str) -> int:
+        """Scan the next piece of text; returns the absolute end index of the block, or -1"""
+        offset = self.offset
+        self.offset += len(text)
+        for i, ch in enumerate(text, offset):
+            if self.start < 0:
+                if ch == '{':
+                    self.start, self.depth = i, 1
+                continue
+            if self.escaped:
+                self.escaped = False
+            elif ch == '\\':
+                self.escaped = self.in_string
+            elif ch == '"':
+                self.in_string = not self.in_string
+            elif not self.in_string:
+                if ch == '{':
+                    self.depth += 1
+                elif ch == '}':
+                    self.depth -= 1
+                    if self.depth == 0:
+                        return i + 1
+        return -1
+
+
+def find_json_block(text: str) -> Optional[str]:
+    """Return the first balanced {...} block in text, or None"""
+    scanner = JsonBlockScanner()
+    end = scanner.feed(text)
+    return text[scanner.start:end] if end >= 0 else None
+
+
+async def stream_json_block(llm: Any, messages: List[Any]) -> str:
+    """
+    Stream an LLM completion and stop as soon as the first balanced {...} block is closed.
+    Returns that block, or the full text when the completion contains no JSON object.
+    """
+    parts: List[str] = []
+    scanner = JsonBlockScanner()
+    
+    async with aclosing(llm.astream(messages)) as stream:
+        async for chunk in stream:
+            text = chunk.content
+            if isinstance(text, list):
+                text = "".join(item.get("text", "") if isinstance(item, dict) else str(item) for item in text)
+            parts.append(text)
+            
+            end = scanner.feed(text)
+            if end >= 0:
+                return "".join(parts)[scanner.start:end]
+    
+    return "".join(parts)
@@ -0,0 +1,134 @@
+"""
+Content-addressed cache for LLM responses
+Identical prompts sent to the same model are answered from a local SQLite store
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Awaitable, Callable, List, Optional
+
+from langchain_core.messages import BaseMessage
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = "./tmp/llm_cache.db"
+
+
+class LLMCache:
+    """SQLite-backed (WAL mode) cache keyed by SHA256 of model namespace + messages"""
+
+    def __init__(self, db_path: str = DEFAULT_CACHE_PATH, enabled: bool = True):
+        self.db_path = db_path
+        self.enabled = enabled
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, response TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def make_namespace(
+        provider: str, model_name: str, base_url: Optional[str] = None, temperature: Optional[float] = None
+    ) -> str:
+        """Build the namespace for a model configuration; endpoint and temperature change outputs too"""
+        return f"{provider}:{model_name}|{base_url or ''}|{temperature}"
+
+    @staticmethod
+    def make_key(namespace: str, messages: List[BaseMessage]) -> str:
+        """Build the cache key for a model namespace and message list"""
+        payload = json.dumps(
+            [namespace, [(m.type, m.content) for m in messages]],
+            sort_keys=True,
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT response FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def _set(self, key: str, response: str):
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, response, created_at) VALUES (?, ?, ?)",
+                (key, response, time.time())
+            )
+            conn.commit()
+
+    async def get_or_call(
+        self,
+        namespace: str,
+        messages: List[BaseMessage],
+        invoke: Callable[[List[BaseMessage]], Awaitable[Any]],
+        refresh: bool = False
+    ) -> Any:
+        """
+        Return the cached response content for these messages, or call the LLM and cache it
+
+        Args:
+            namespace: Identifies the model configuration (see make_namespace) so different
+                models, endpoints and temperatures never share entries
+            messages: Messages that would be sent to the LLM
+            invoke: Coroutine function performing the actual LLM call (e.g. llm.ainvoke);
+                may return a message or the response text directly
+            refresh: Skip the lookup and call the LLM, replacing any cached entry
+
+        Returns:
+            Response content (str for text responses)
+        """
+        if not self.enabled:
+            response = await invoke(messages)
+            return getattr(response, "content", response)
+
+        key = self.make_key(namespace, messages)
+        if not refresh:
+            try:
+                cached = await asyncio.to_thread(self._get, key)
+                if cached is not None:
+                    logger.debug(f"LLM cache hit for {namespace}")
+                    return cached
+            except sqlite3.Error as e:
+                logger.warning(f"LLM cache read failed: {e}")
+
+        response = await invoke(messages)
+        content = getattr(response, "content", response)
+
+        # Only plain-text responses are cached; content-block lists pass through
+        if isinstance(content, str):
+            try:
+                await asyncio.to_thread(self._set, key, content)
+            except sqlite3.Error as e:
+                logger.warning(f"LLM cache write failed: {e}")
+        return content
+
+
+_default_cache: Optional[LLMCache] = None
+
+
+def get_default_cache() -> LLMCache:
+    """Get the process-wide LLM cache configured from LLM_CACHE_ENABLED / LLM_CACHE_PATH"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = LLMCache(
+            db_path=os.getenv("LLM_CACHE_PATH", DEFAULT_CACHE_PATH),
+            enabled=os.getenv("LLM_CACHE_ENABLED", "false").lower() == "true"
+        )
+    return _default_cache
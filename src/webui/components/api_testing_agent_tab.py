@@ -2,10 +2,10 @@
 API Testing Agent Tab - Gherkin Generator & Validator Only
 """
 import gradio as gr
-import asyncio
 import json
 import logging
 import re
+import orjson
 from typing import Dict, Any, Optional
 from datetime import datetime
 
@@ -14,6 +14,20 @@ from src.agent.api_testing.api_testing_agent import APITestingAgent
 
 logger = logging.getLogger(__name__)
 
+# Gherkin structure checks used by the validator
+_FEATURE_RE = re.compile(r'^\s*Feature:', re.MULTILINE)
+_SCENARIO_RE = re.compile(r'^\s*Scenario:', re.MULTILINE)
+_STEP_RE = re.compile(r'^\s*(?:Given|When|Then|And|But)\s+', re.MULTILINE)
+
+
+def _to_json(data: Dict[str, Any]) -> str:
+    """Pretty-print a result payload for the JSON output panel"""
+    try:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+    except orjson.JSONEncodeError:
+        # e.g. integers beyond 64 bits, which only the stdlib encoder handles
+        return json.dumps(data, indent=2)
+
 
 def create_api_testing_agent_tab(webui_manager: WebuiManager):
     """Creates the simplified API Testing tab with only Gherkin generator and validator"""
@@ -45,11 +59,19 @@ def create_api_testing_agent_tab(webui_manager: WebuiManager):
                 lines=2
             )
             
-            generate_btn = gr.Button(
-                "🤖 Generate Gherkin Scenario",
-                variant="primary",
-                size="lg"
-            )
+            with gr.Row():
+                generate_btn = gr.Button(
+                    "🤖 Generate Gherkin Scenario",
+                    variant="primary",
+                    size="lg",
+                    scale=4
+                )
+                force_regenerate = gr.Checkbox(
+                    label="Force regenerate",
+                    value=False,
+                    info="Ignore cached results and call the LLM again",
+                    scale=1
+                )
             
             generated_gherkin = gr.Textbox(
                 label="Generated Gherkin Scenario",
@@ -123,7 +145,8 @@ def create_api_testing_agent_tab(webui_manager: WebuiManager):
         
         async def generate_gherkin_handler(prompt: str, context: str, 
                                           llm_provider: str, model_name: str,
-                                          api_key: str, base_url: str):
+                                          api_key: str, base_url: str,
+                                          force_regenerate: bool = False):
             """Generate Gherkin scenario from natural language"""
             try:
                 if not prompt or not prompt.strip():
@@ -143,14 +166,13 @@ def create_api_testing_agent_tab(webui_manager: WebuiManager):
                     base_url=base_url if base_url else None
                 )
                 
-                # Generate Gherkin
-                gherkin = await agent.generate_gherkin_from_prompt(
+                # Generate Gherkin; repeat prompts are answered by the LLM cache unless forced
+                return await agent.generate_gherkin_from_prompt(
                     prompt=prompt,
-                    context=context if context else None
+                    context=context if context else None,
+                    refresh=bool(force_regenerate)
                 )
                 
-                return gherkin
-                
             except Exception as e:
                 logger.error(f"Error generating Gherkin: {e}")
                 return f"❌ Error: {str(e)}"
@@ -165,18 +187,15 @@ def create_api_testing_agent_tab(webui_manager: WebuiManager):
                 errors = []
                 
                 # Check for Feature
-                if not re.search(r'^\s*Feature:', gherkin_text, re.MULTILINE):
+                if not _FEATURE_RE.search(gherkin_text):
                     errors.append("Missing 'Feature:' declaration")
                 
                 # Check for Scenario
-                if not re.search(r'^\s*Scenario:', gherkin_text, re.MULTILINE):
+                if not _SCENARIO_RE.search(gherkin_text):
                     errors.append("Missing 'Scenario:' declaration")
                 
                 # Check for steps
-                step_keywords = ['Given', 'When', 'Then', 'And', 'But']
-                has_steps = any(re.search(rf'^\s*{kw}\s+', gherkin_text, re.MULTILINE) 
-                               for kw in step_keywords)
-                if not has_steps:
+                if not _STEP_RE.search(gherkin_text):
                     errors.append("No test steps found (Given/When/Then)")
                 
                 if errors:
@@ -212,7 +231,10 @@ def create_api_testing_agent_tab(webui_manager: WebuiManager):
                 
                 # Execute the Gherkin scenario
                 # The agent will parse the Gherkin and extract API details automatically
-                result = await agent.execute_gherkin_scenario(gherkin_text)
+                try:
+                    result = await agent.execute_gherkin_scenario(gherkin_text)
+                finally:
+                    await agent.close()
                 
                 # Format results with full response at the top
                 result_dict = {
@@ -235,7 +257,7 @@ def create_api_testing_agent_tab(webui_manager: WebuiManager):
                 else:
                     status_msg = f"⚠️ Test SKIPPED: {result.message}"
                 
-                return status_msg, json.dumps(result_dict, indent=2)
+                return status_msg, _to_json(result_dict)
                 
             except Exception as e:
                 logger.error(f"Error executing test: {e}", exc_info=True)
@@ -244,23 +266,24 @@ def create_api_testing_agent_tab(webui_manager: WebuiManager):
                     "error": str(e),
                     "timestamp": datetime.now().isoformat()
                 }
-                return f"❌ Execution error: {str(e)}", json.dumps(error_result, indent=2)
+                return f"❌ Execution error: {str(e)}", _to_json(error_result)
         
         def clear_all_handler():
             """Clear all fields"""
             return "", "", "", "", ""
         
-        # Wire up the event handlers
+        # Wire up the event handlers; async handlers run directly on Gradio's event loop instead of
+        # a fresh loop per click, and each execution creates and closes its own agent and sessions
         generate_btn.click(
-            fn=lambda prompt, context, llm_prov, llm_model, llm_key, llm_url: 
-                asyncio.run(generate_gherkin_handler(prompt, context, llm_prov, llm_model, llm_key, llm_url)),
+            fn=generate_gherkin_handler,
             inputs=[
                 gherkin_prompt,
                 context_input,
                 get_agent_setting_component("llm_provider"),
                 get_agent_setting_component("llm_model_name"),
                 get_agent_setting_component("llm_api_key"),
-                get_agent_setting_component("llm_base_url")
+                get_agent_setting_component("llm_base_url"),
+                force_regenerate
             ],
             outputs=[generated_gherkin]
         )
@@ -272,8 +295,7 @@ def create_api_testing_agent_tab(webui_manager: WebuiManager):
         )
         
         execute_btn.click(
-            fn=lambda gherkin, llm_prov, llm_model, llm_key, llm_url:
-                asyncio.run(execute_test_handler(gherkin, llm_prov, llm_model, llm_key, llm_url)),
+            fn=execute_test_handler,
             inputs=[
                 generated_gherkin,
                 get_agent_setting_component("llm_provider"),
@@ -3,7 +3,6 @@ PR Testing Agent Tab - Complete workflow for automated PR validation
 Provides UI for Azure DevOps integration, PR selection, and automated testing
 """
 import gradio as gr
-import asyncio
 import logging
 import os
 import re
@@ -219,21 +218,21 @@ def create_pr_testing_agent_tab(webui_manager: WebuiManager):
             logger.info(f"Fetching PRs from {org}/{proj}/{repo}")
             
             client = AzureDevOpsClient(org, proj, pat, repo)
-            prs = await client.list_pull_requests(branch if branch.strip() else None)
+            prs = await client.list_pull_request_summaries(branch if branch.strip() else None)
             
             pr_list = []
             pr_choices = []
             for pr in prs:
-                pr_id = pr["pullRequestId"]
-                pr_title = pr["title"][:80]
+                pr_id = pr.id
+                pr_title = pr.title[:80]
                 pr_list.append([
                     pr_id,
                     pr_title,
-                    pr["createdBy"]["displayName"],
-                    pr["status"],
-                    pr["sourceRefName"].replace("refs/heads/", ""),
-                    pr["targetRefName"].replace("refs/heads/", ""),
-                    pr["creationDate"][:10]
+                    pr.author,
+                    pr.status,
+                    pr.source_branch,
+                    pr.target_branch,
+                    pr.creation_date[:10]
                 ])
                 # Format: "PR #123: Title"
                 pr_choices.append(f"PR #{pr_id}: {pr_title}")
@@ -323,28 +322,23 @@ def create_pr_testing_agent_tab(webui_manager: WebuiManager):
             client = AzureDevOpsClient(organization, project, pat, repository)
             pr_details = await client.get_pr_details(pr_id)
             
-            # Fetch detailed work item information (in parallel, limit to 2 most recent)
+            # Fetch detailed work item information (one batch request, limit to 2 most recent)
             work_items_detailed = []
             workitems = pr_details.get("workitems", [])[:2]  # Limit to 2 work items for speed
             
             if workitems:
-                # Fetch work items in parallel for speed
-                async def fetch_work_item(wi):
+                work_item_ids = []
+                for wi in workitems:
                     try:
                         wi_id = wi.get("id")
                         if not wi_id and "url" in wi:
                             wi_id = int(wi["url"].split("/")[-1])
-                        
                         if wi_id:
-                            wi_details = await client.get_work_item_details(wi_id)
-                            return wi_details
+                            work_item_ids.append(int(wi_id))
                     except Exception as e:
-                        logger.warning(f"Failed to fetch work item details: {e}")
-                    return None
+                        logger.warning(f"Failed to read work item reference: {e}")
                 
-                # Fetch all work items concurrently (should take ~1-2 seconds total)
-                work_items_results = await asyncio.gather(*[fetch_work_item(wi) for wi in workitems])
-                work_items_detailed = [wi for wi in work_items_results if wi]
+                work_items_detailed = await client.get_work_items_batch(work_item_ids)
             
             # Build PR context
             file_changes = []
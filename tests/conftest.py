@@ -0,0 +1,155 @@
+"""
+Shared fixtures for the offline tests: agents built without LLM/browser setup, fake LLMs and
+browsers, and a runner that routes the shared HTTP client to a mocked transport
+"""
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+os.environ.setdefault("ANONYMIZED_TELEMETRY", "false")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class FakeLLM:
+    """LLM stand-in: ainvoke answers with the scripted text (or "answer N"), astream yields pieces"""
+
+    def __init__(self, answer=None, pieces=()):
+        self.answer = answer
+        self.pieces = list(pieces)
+        self.calls = 0
+        self.consumed = 0
+        self.closed = False
+
+    async def ainvoke(self, messages):
+        from langchain_core.messages import AIMessage
+
+        self.calls += 1
+        return AIMessage(content=self.answer if self.answer is not None else f"answer {self.calls}")
+
+    async def astream(self, messages):
+        try:
+            for piece in self.pieces:
+                self.consumed += 1
+                yield SimpleNamespace(content=piece)
+        finally:
+            self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self, config=None):
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeValidator:
+    """APIValidator stand-in answering every request with the given HTTPResponse"""
+
+    def __init__(self, response=None):
+        self.response = response
+        self.requests = []
+
+    async def send_request(self, method, url, **kwargs):
+        self.requests.append((method, url))
+        return self.response
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture
+def fake_llm():
+    """The FakeLLM class, to build one per scripted answer"""
+    return FakeLLM
+
+
+@pytest.fixture
+def bare_api_agent():
+    """APITestingAgent without LLM/browser setup, enough for result bookkeeping"""
+    from src.agent.api_testing.api_testing_agent import APITestingAgent
+
+    agent = APITestingAgent.__new__(APITestingAgent)
+    agent.test_results = []
+    return agent
+
+
+@pytest.fixture
+def pooled_api_agent(monkeypatch, bare_api_agent):
+    """Factory turning the bare agent into one with a browser pool of FakeBrowsers"""
+    from src.agent.api_testing import api_testing_agent
+
+    def make(max_browsers: int):
+        monkeypatch.setattr(api_testing_agent, "CustomBrowser", FakeBrowser)
+        bare_api_agent.api_validator = FakeValidator()
+        bare_api_agent.browser_config = None
+        bare_api_agent._max_browsers = max_browsers
+        bare_api_agent._browsers = []
+        bare_api_agent._browser_pool = asyncio.Queue(maxsize=max_browsers)
+        return bare_api_agent
+    return make
+
+
+@pytest.fixture
+def scripted_api_agent(bare_api_agent):
+    """Factory for a bare agent whose requests all get the given status code and JSON body"""
+    from src.agent.api_testing.api_testing_agent import HTTPResponse
+
+    def make(status_code: int, data):
+        bare_api_agent.api_validator = FakeValidator(HTTPResponse(status_code, {}, data, 1.0))
+        bare_api_agent._request_semaphore = asyncio.Semaphore(1)
+        return bare_api_agent
+    return make
+
+
+@pytest.fixture
+def api_validator():
+    """Factory for an APIValidator whose LLM is a FakeLLM giving the scripted answer"""
+    from src.agent.api_testing.api_testing_agent import APIValidator
+
+    def make(answer="VALID"):
+        validator = APIValidator.__new__(APIValidator)
+        validator.llm = FakeLLM(answer)
+        validator._session = None
+        validator._host_semaphores = {}
+        return validator
+    return make
+
+
+@pytest.fixture
+def bare_test_generator():
+    """TestGenerator without an LLM, enough for response parsing"""
+    from src.agent.pr_testing.test_generator import TestGenerator
+
+    return TestGenerator.__new__(TestGenerator)
+
+
+@pytest.fixture
+def run_with_transport():
+    """Run make_coro() with the shared HTTP client routed to handler and fresh cache/limits"""
+    from src.utils import azure_devops_client, http_client
+
+    def run(handler, make_coro):
+        async def main():
+            http_client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            http_client._client_loop = asyncio.get_running_loop()
+            azure_devops_client._response_cache.clear()
+            azure_devops_client._rate_limiters.clear()
+            try:
+                return await make_coro()
+            finally:
+                await http_client.close_client()
+        return asyncio.run(main())
+    return run
+
+
+@pytest.fixture
+def ado_client():
+    """AzureDevOpsClient with dummy credentials, for use with run_with_transport"""
+    from src.utils.azure_devops_client import AzureDevOpsClient
+
+    return AzureDevOpsClient("org", "proj", "pat", "repo")
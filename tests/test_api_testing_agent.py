@@ -0,0 +1,261 @@
+"""
+Offline tests for the API testing agent helpers (no LLM, browser or network access)
+"""
+import asyncio
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aiohttp import test_utils, web
+from multidict import CIMultiDict, CIMultiDictProxy
+
+from src.agent.api_testing import api_testing_agent
+
+
+def test_save_test_results_with_response_headers(tmp_path, bare_api_agent):
+    headers = dict(CIMultiDictProxy(CIMultiDict({"Content-Type": "application/json"})))
+    bare_api_agent.test_results.append(api_testing_agent.TestResult(
+        success=True,
+        scenario_name="headers",
+        timestamp="2024-01-01T00:00:00",
+        api_response={"status_code": 200, "headers": headers}
+    ))
+
+    output = tmp_path / "results.json"
+    bare_api_agent.save_test_results(str(output))
+
+    saved = json.loads(output.read_text())
+    assert saved[0]["api_response"]["headers"] == {"Content-Type": "application/json"}
+    assert [p.name for p in tmp_path.iterdir()] == ["results.json"]
+
+
+def test_save_test_results_falls_back_to_stdlib_json(tmp_path, bare_api_agent):
+    bare_api_agent.test_results.append(api_testing_agent.TestResult(
+        success=True,
+        scenario_name="big ints",
+        timestamp="2024-01-01T00:00:00",
+        api_response={"body": {"id": 2 ** 70}, "codes": {404: "missing"}}
+    ))
+
+    output = tmp_path / "results.json"
+    bare_api_agent.save_test_results(str(output))
+
+    saved = json.loads(output.read_text())
+    assert saved[0]["api_response"] == {"body": {"id": 2 ** 70}, "codes": {"404": "missing"}}
+    assert [p.name for p in tmp_path.iterdir()] == ["results.json"]
+
+
+def test_save_test_results_failure_leaves_no_temp_file(tmp_path, bare_api_agent):
+    bare_api_agent.test_results.append(api_testing_agent.TestResult(
+        success=True,
+        scenario_name="unserializable",
+        timestamp="2024-01-01T00:00:00",
+        api_response={"body": object()}
+    ))
+
+    output = tmp_path / "results.json"
+    try:
+        bare_api_agent.save_test_results(str(output))
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("expected serialization to fail")
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_get_test_results_returns_fresh_dicts(bare_api_agent):
+    bare_api_agent.test_results.append(api_testing_agent.TestResult(
+        success=False, scenario_name="first", timestamp="2024-01-01T00:00:00"
+    ))
+
+    first = bare_api_agent.get_test_results()
+    first[0]["success"] = True
+    assert bare_api_agent.get_test_results()[0]["success"] is False
+
+    bare_api_agent.test_results[0].success = True
+    bare_api_agent.test_results.append(api_testing_agent.TestResult(
+        success=True, scenario_name="second", timestamp="2024-01-01T00:00:01"
+    ))
+    assert [r["success"] for r in bare_api_agent.get_test_results()] == [True, True]
+
+
+def test_get_test_results_shares_nested_payloads(bare_api_agent):
+    payload = {"status_code": 200, "body": {"id": 1}}
+    bare_api_agent.test_results.append(api_testing_agent.TestResult(
+        success=True, scenario_name="payload", timestamp="2024-01-01T00:00:00", api_response=payload
+    ))
+    # Documented shallow copy: nested payloads are not duplicated per call
+    assert bare_api_agent.get_test_results()[0]["api_response"] is payload
+
+
+def test_browser_pool_reuses_released_browsers(pooled_api_agent):
+    async def run():
+        agent = pooled_api_agent(1)
+        first = await agent._acquire_browser()
+        await agent._release_browser(first)
+        assert await agent._acquire_browser() is first
+
+    asyncio.run(run())
+
+
+def test_close_wakes_waiters_and_closes_browsers_on_release(pooled_api_agent):
+    async def run():
+        agent = pooled_api_agent(2)
+        busy = await agent._acquire_browser()
+        idle = await agent._acquire_browser()
+        await agent._release_browser(idle)
+        assert await agent._acquire_browser() is idle
+        waiters = [asyncio.create_task(agent._acquire_browser()) for _ in range(3)]
+        await asyncio.sleep(0)
+
+        await agent.close()
+        results = await asyncio.wait_for(asyncio.gather(*waiters, return_exceptions=True), timeout=1)
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert not busy.closed and not idle.closed
+
+        await agent._release_browser(busy)
+        await agent._release_browser(idle)
+        assert busy.closed and idle.closed
+
+        # A fresh pool is started for later use
+        fresh = await agent._acquire_browser()
+        assert fresh is not busy and fresh is not idle
+
+    asyncio.run(run())
+
+
+def test_close_closes_idle_browsers(pooled_api_agent):
+    async def run():
+        agent = pooled_api_agent(1)
+        browser = await agent._acquire_browser()
+        await agent._release_browser(browser)
+        await agent.close()
+        assert browser.closed
+
+    asyncio.run(run())
+
+
+def test_get_nested_value_follows_keys_and_indexes(api_validator):
+    validator = api_validator()
+    data = {"data": {"items": [{"id": 1}, {"id": 2, "tags": ["a", "b"]}]}}
+    assert validator._get_nested_value(data, "data.items[1].id") == 2
+    assert validator._get_nested_value(data, "data.items[1].tags[0]") == "a"
+    assert api_testing_agent._compile_path("data.items[1].id") == (("data", None), ("items", 1), ("id", None))
+
+    extracted = validator._extract_values(data, {"first": "data.items[0].id", "missing": "data.total"})
+    assert extracted["first"] == 1
+    assert extracted["missing"].startswith("Error extracting")
+
+
+def test_retry_delay_prefers_retry_after_and_caps_backoff():
+    assert api_testing_agent._retry_delay(0, "2") == 2.0
+    assert api_testing_agent._retry_delay(0, "-5") == 0.0
+    assert api_testing_agent._retry_delay(0, "3600") == api_testing_agent._MAX_RETRY_DELAY
+    assert api_testing_agent._retry_delay(0, "Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert 2 <= api_testing_agent._retry_delay(1, "soon") < 3
+    assert api_testing_agent._retry_delay(10) == api_testing_agent._MAX_RETRY_DELAY
+
+
+def test_send_request_retries_transient_statuses_for_idempotent_methods(monkeypatch, api_validator):
+    monkeypatch.setattr(api_testing_agent, "_retry_delay", lambda attempt, retry_after=None: 0)
+    hits = []
+
+    async def flaky(request):
+        hits.append(request.method)
+        if len(hits) % 3:
+            return web.Response(status=503)
+        return web.json_response({"ok": True})
+
+    async def run():
+        app = web.Application()
+        app.router.add_route("*", "/flaky", flaky)
+        validator = api_validator()
+        async with test_utils.TestServer(app) as server:
+            try:
+                ok = await validator.send_request("GET", str(server.make_url("/flaky")))
+                # Non-idempotent methods only retry on 429, so the 503 comes straight back
+                failed = await validator.send_request("POST", str(server.make_url("/flaky")))
+            finally:
+                await validator.close()
+        return ok, failed
+
+    ok, failed = asyncio.run(run())
+    assert (ok.status_code, ok.data) == (200, {"ok": True})
+    assert failed.status_code == 503
+    assert hits == ["GET", "GET", "GET", "POST"]
+
+
+def test_step_method_uses_fixed_priority():
+    assert api_testing_agent._step_method('When I send a GET request to the endpoint') == 'GET'
+    assert api_testing_agent._step_method('When I send a DELETE request after a POST request') == 'POST'
+    assert api_testing_agent._step_method('When a PUT request follows the GET request') == 'GET'
+    assert api_testing_agent._step_method('Then the status code should be 200') is None
+
+
+USERS_SCENARIO = """
+Scenario: Create a user
+  Given the API endpoint is "https://api.example.test/users"
+  When I send a POST request to create the user with the following details:
+    | field | value |
+    | name  | Ada   |
+    | id    | 7     |
+  Then the response should contain "Ada"
+  And the status code should be 201
+"""
+
+
+def test_execute_gherkin_scenario_reads_steps_in_one_pass(scripted_api_agent):
+    agent = scripted_api_agent(201, {"id": 7, "name": "Ada"})
+    result = asyncio.run(agent.execute_gherkin_scenario(USERS_SCENARIO))
+
+    assert agent.api_validator.requests == [("POST", "https://api.example.test/users")]
+    assert result.status is api_testing_agent.TestStatus.PASSED, result.validation_errors
+    # The step right after the table is still checked
+    assert result.extracted_values == {"validated_name": "Ada", "validated_id": "7", "contains_Ada": True}
+    assert agent.test_results[0].scenario_name == "Create a user"
+
+
+def test_execute_gherkin_scenario_reports_every_failed_check(scripted_api_agent):
+    scenario = USERS_SCENARIO + "  And the response should be a JSON array\n"
+    agent = scripted_api_agent(200, {"id": 8, "name": "Grace"})
+    result = asyncio.run(agent.execute_gherkin_scenario(scenario))
+
+    assert result.status is api_testing_agent.TestStatus.FAILED
+    assert result.validation_errors == [
+        "Expected status 201, got 200",
+        "User with fields (name=Ada, id=7) not found in response",
+        "Response does not contain 'Ada'",
+        "Response is not a JSON array",
+    ]
+
+
+def test_execute_gherkin_scenario_without_url_fails_early(scripted_api_agent):
+    agent = scripted_api_agent(200, {})
+    result = asyncio.run(agent.execute_gherkin_scenario("Scenario: No URL\n  When I send a GET request"))
+    assert not result.success and result.errors == ["Could not extract API URL from Gherkin scenario"]
+    assert agent.api_validator.requests == []
+
+
+def test_validate_schema_compiles_only_marked_schemas(api_validator):
+    validator = api_validator()
+    schema = {"$schema": "http://json-schema.org/draft-07/schema#", "type": "object",
+              "required": ["id"], "properties": {"id": {"type": "integer"}}}
+
+    assert asyncio.run(validator._validate_schema({"id": 1}, schema)) == (True, None)
+    valid, reason = asyncio.run(validator._validate_schema({"id": "x"}, schema))
+    assert not valid and "integer" in reason
+    assert validator.llm.calls == 0
+
+    # A prose description that happens to use "type" still goes to the LLM
+    assert asyncio.run(validator._validate_schema({"id": 1}, {"type": "a user object with an id"})) == (True, None)
+    assert validator.llm.calls == 1
+
+
+def test_validate_schema_reports_uncompilable_schema_as_failure(api_validator):
+    validator = api_validator()
+    for schema in ({"$schema": "x", "type": "not-a-type"}, {"$schema": "x", "pattern": "("}):
+        valid, reason = asyncio.run(validator._validate_schema({}, schema))
+        assert not valid and reason.startswith("invalid JSON Schema")
+    assert validator.llm.calls == 0
@@ -0,0 +1,165 @@
+"""
+Offline tests for the Azure DevOps client against a mocked transport (no network or PAT needed)
+"""
+import asyncio
+import os
+import sys
+import time
+from contextlib import aclosing
+
+import httpx
+import orjson
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils import azure_devops_client
+
+PR_URL = "https://dev.azure.com/org/proj/_apis/git/repositories/repo/pullrequests"
+
+
+def _failing_pr_handler(request: httpx.Request) -> httpx.Response:
+    if request.url.path.rstrip("/").split("/")[-2] == "pullrequests":
+        return httpx.Response(500, json={"message": "boom"})
+    return httpx.Response(200, json={"value": []})
+
+
+def test_get_pr_details_two_failed_prs_raise_their_own_errors(run_with_transport, ado_client):
+    results = run_with_transport(_failing_pr_handler, lambda: asyncio.gather(
+        ado_client.get_pr_details(1), ado_client.get_pr_details(2), return_exceptions=True
+    ))
+
+    assert len(results) == 2
+    for pr_id, error in zip((1, 2), results):
+        # The typed HTTP error propagates as is, with every sibling failure kept in its cause
+        assert isinstance(error, httpx.HTTPStatusError)
+        assert error.response.status_code == 500
+        assert error.request.url.path.endswith(f"/pullrequests/{pr_id}")
+        assert isinstance(error.__cause__, ExceptionGroup)
+
+
+def test_fetch_pr_details_keeps_every_failure_in_the_cause(run_with_transport, ado_client):
+    async def failing_changes(pr_url, pr_id):
+        raise RuntimeError("changes failed")
+    ado_client._fetch_latest_changes = failing_changes
+
+    async def run():
+        try:
+            await ado_client._fetch_pr_details(f"{PR_URL}/1", 1)
+        except (httpx.HTTPStatusError, RuntimeError) as e:
+            return e
+        raise AssertionError("expected the PR fetch to fail")
+
+    error = run_with_transport(_failing_pr_handler, run)
+    group = error.__cause__
+    assert isinstance(group, ExceptionGroup)
+    assert error in group.exceptions
+    assert {type(e) for e in group.exceptions} == {httpx.HTTPStatusError, RuntimeError}
+
+
+class _TrackedStream(httpx.AsyncByteStream):
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.closed = False
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            yield chunk
+
+    async def aclose(self):
+        self.closed = True
+
+
+def test_stream_file_content_early_exit_closes_response(run_with_transport, ado_client):
+    stream = _TrackedStream([b"first", b"second", b"third"])
+
+    async def run():
+        received = []
+        async with aclosing(ado_client.stream_file_content("/big.bin", "abc123", chunk_size=5)) as chunks:
+            async for chunk in chunks:
+                received.append(chunk)
+                break
+        return received
+
+    received = run_with_transport(lambda request: httpx.Response(200, stream=stream), run)
+    assert received == [b"first"]
+    assert stream.closed
+
+
+def test_open_retries_after_429_then_succeeds(run_with_transport):
+    calls = []
+
+    def handler(request):
+        calls.append(time.monotonic())
+        if len(calls) < 3:
+            return httpx.Response(429, headers={"Retry-After": "0.05"})
+        return httpx.Response(200, json={"value": [{"id": 1}]})
+
+    result = run_with_transport(handler, lambda: azure_devops_client._request_value(
+        "org", "GET", "https://dev.azure.com/org/_apis/projects", {}
+    ))
+    assert result == [{"id": 1}]
+    assert len(calls) == 3
+    assert calls[1] - calls[0] >= 0.04 and calls[2] - calls[1] >= 0.04
+    # Throttled attempts were refunded, so only the successful request used a token
+    bucket = azure_devops_client._rate_limiters["org"]
+    assert bucket.tokens > bucket.capacity - 1.5
+
+
+def test_open_gives_up_after_max_attempts_of_429(run_with_transport):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(429, headers={"Retry-After": "not-a-number"})
+
+    async def run():
+        with pytest.raises(httpx.HTTPStatusError) as info:
+            await azure_devops_client._request("org", "GET", "https://dev.azure.com/org/_apis/projects", {})
+        return info.value.response.status_code
+
+    # An unparseable Retry-After falls back to one second between attempts
+    start = time.monotonic()
+    assert run_with_transport(handler, run) == 429
+    assert len(calls) == azure_devops_client._MAX_ATTEMPTS
+    assert time.monotonic() - start >= 1.5
+
+
+def test_get_work_items_batch_chunks_at_200_ids(run_with_transport, ado_client):
+    batches = []
+
+    def handler(request):
+        ids = orjson.loads(request.content)["ids"]
+        batches.append(ids)
+        # Deleted items come back as null with errorPolicy=omit
+        return httpx.Response(200, json={"value": [None if i % 100 == 0 else {"id": i} for i in ids]})
+
+    ids = list(range(1, 451))
+    items = run_with_transport(handler, lambda: ado_client.get_work_items_batch(ids))
+
+    assert sorted(len(batch) for batch in batches) == [50, 200, 200]
+    assert sorted(i for batch in batches for i in batch) == ids
+    assert [item["id"] for item in items] == [i for i in ids if i % 100]
+
+
+def test_get_work_items_batch_skips_ids_omitted_before(run_with_transport, ado_client):
+    batches = []
+
+    def handler(request):
+        ids = orjson.loads(request.content)["ids"]
+        batches.append(ids)
+        return httpx.Response(200, json={"value": [None if i == 2 else {"id": i} for i in ids]})
+
+
+    async def run():
+        first = await ado_client.get_work_items_batch([1, 2])
+        # A different combination misses the batch cache but not the per-ID not-found entry
+        second = await ado_client.get_work_items_batch([2, 3])
+        detail = await ado_client.get_work_item_details(2)
+        return first, second, detail
+
+    first, second, detail = run_with_transport(handler, run)
+    assert [wi["id"] for wi in first] == [1]
+    assert [wi["id"] for wi in second] == [3]
+    assert detail == {}
+    assert batches == [[1, 2], [3]]
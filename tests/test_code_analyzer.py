@@ -0,0 +1,53 @@
+"""
+Offline tests for PR impact classification
+"""
+import itertools
+import os
+import re
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.agent.pr_testing.code_analyzer import CodeAnalyzer
+
+_DIRS = ('', 'src/', 'app\\', 'myapi/', 'api/', 'Endpoint\\', 'routes/', 'route/', 'controller\\',
+         'services/', 'service/', 'handler/', 'component/', 'components/', 'migration/',
+         'migrations\\', 'Schema/', 'database/', 'alembic\\', 'web/ui/')
+_FILES = ('views.py', 'view.py', 'reviews.py', 'App.tsx', 'util.ts', 'x.jsx', 'x.js', 'a.vue',
+          'index.html', 's.css', 's.scss', 's.less', 'models.py', 'model.py', 'Models.PY',
+          '001_init.sql', 'schema.json', 'main.py', 'api', 'README.md', 'ts', 'x.tsx.bak')
+
+
+def _reference(path_lower):
+    return tuple(
+        any(re.search(p, path_lower) for p in patterns)
+        for patterns in (CodeAnalyzer.API_PATTERNS, CodeAnalyzer.UI_PATTERNS, CodeAnalyzer.DATABASE_PATTERNS)
+    )
+
+
+def test_classify_matches_reference_patterns():
+    for first, second, name in itertools.product(_DIRS, _DIRS, _FILES):
+        path_lower = (first + second + name).lower()
+        assert CodeAnalyzer._classify(path_lower) == _reference(path_lower), path_lower
+
+
+def test_classify_flags_every_matching_bucket():
+    assert CodeAnalyzer._classify("src/api/models.py") == (True, False, True)
+    assert CodeAnalyzer._classify("web\\component\\button.vue") == (False, True, False)
+    assert CodeAnalyzer._classify("readme.md") == (False, False, False)
+
+
+def test_subclass_pattern_overrides_are_honored():
+    class GraphQLAnalyzer(CodeAnalyzer):
+        API_PATTERNS = CodeAnalyzer.API_PATTERNS + [r'graphql[/\\]']
+        UI_PATTERNS = []
+
+    assert CodeAnalyzer()._pattern_classifier() == CodeAnalyzer._classify
+    classify = GraphQLAnalyzer()._pattern_classifier()
+    assert classify("src/graphql/schema.py") == (True, False, False)
+    assert classify("web/components/app.tsx") == (False, False, False)
+    assert classify("db/models.py") == (False, False, True)
+
+    paths = ("src/graphql/resolvers.py", "web/component/app.tsx")
+    assert GraphQLAnalyzer()._collect_impacts(paths)[1] == frozenset({"resolvers"})
+    assert CodeAnalyzer()._collect_impacts(paths)[2] == frozenset({"app"})
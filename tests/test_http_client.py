@@ -0,0 +1,199 @@
+"""
+Offline tests for the shared HTTP helpers: rate limiting and the response cache
+"""
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils import http_client
+from src.utils.http_client import (
+    CacheMissError, CachePolicy, ResponseCache, TokenBucket, client_lifespan, get_client
+)
+
+
+def test_token_bucket_refills_at_rate_up_to_capacity():
+    bucket = TokenBucket(rpm=60, capacity=10)
+    bucket.tokens = 0
+    bucket.last_update -= 5
+    bucket._refill()
+    assert 5 <= bucket.tokens < 5.5
+
+    bucket.last_update -= 600
+    bucket._refill()
+    assert bucket.tokens == 10
+
+
+def test_token_bucket_acquire_waits_for_refill():
+    async def run():
+        bucket = TokenBucket(rpm=600, capacity=1)  # one token every 0.1s
+        await bucket.acquire()
+        start = time.monotonic()
+        await bucket.acquire()
+        return time.monotonic() - start
+
+    assert 0.05 <= asyncio.run(run()) < 1
+
+
+def test_token_bucket_refund_is_capped_and_reusable():
+    async def run():
+        bucket = TokenBucket(rpm=1, capacity=2)
+        await bucket.refund(5)
+        assert bucket.tokens == 2
+        await bucket.acquire()
+        await bucket.refund()
+        start = time.monotonic()
+        await bucket.acquire()
+        await bucket.acquire()
+        return time.monotonic() - start
+
+    assert asyncio.run(run()) < 0.5
+
+
+def test_token_bucket_refund_not_blocked_by_sleeping_waiter():
+    async def run():
+        bucket = TokenBucket(rpm=6, capacity=1)  # next token only after 10s
+        await bucket.acquire()
+        waiter = asyncio.create_task(bucket.acquire())
+        await asyncio.sleep(0.01)
+        # The waiter is sleeping; refund must still get the lock straight away
+        await asyncio.wait_for(bucket.refund(), timeout=0.5)
+        assert bucket.tokens >= 1
+        waiter.cancel()
+
+    asyncio.run(run())
+
+
+def _not_found_error(url="https://example.test/missing"):
+    request = httpx.Request("GET", url)
+    return httpx.HTTPStatusError("404", request=request, response=httpx.Response(404, request=request))
+
+
+class _Fetcher:
+    def __init__(self, result=None, error=None):
+        self.result = result
+        self.error = error
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return f"{self.result} {self.calls}"
+
+
+def test_response_cache_expires_entries_after_ttl():
+    cache = ResponseCache()
+    cache.set("fresh", 1, ttl=60)
+    cache.set("stale", 2, ttl=0)
+    cache.set("forever", 3, ttl=None)
+    assert cache.get("fresh") == (True, 1)
+    assert cache.get("stale") == (False, None)
+    assert cache.get("forever") == (True, 3)
+
+
+def test_response_cache_evicts_least_recently_used():
+    cache = ResponseCache(max_entries=2)
+    cache.set("a", 1, ttl=None)
+    cache.set("b", 2, ttl=None)
+    cache.get("a")
+    cache.set("c", 3, ttl=None)
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 1)
+    assert cache.get("c") == (True, 3)
+
+
+def test_make_key_separates_params_and_credentials():
+    key = ResponseCache.make_key("GET", "https://x/api", {"a": 1, "b": 2}, "Basic one")
+    assert key == ResponseCache.make_key("GET", "https://x/api", {"b": 2, "a": 1}, "Basic one")
+    assert key != ResponseCache.make_key("GET", "https://x/api", {"a": 1, "b": 2}, "Basic two")
+    assert key != ResponseCache.make_key("GET", "https://x/api", {"a": 1}, "Basic one")
+
+
+def test_get_or_fetch_caches_not_found_but_not_other_errors():
+    async def run():
+        cache = ResponseCache()
+        missing = _Fetcher(error=_not_found_error())
+        assert await cache.get_or_fetch("k", 60, missing, not_found="") == ""
+        assert await cache.get_or_fetch("k", 60, missing, not_found="") == ""
+        assert missing.calls == 1
+
+        request = httpx.Request("GET", "https://example.test/busy")
+        busy = _Fetcher(error=httpx.HTTPStatusError(
+            "503", request=request, response=httpx.Response(503, request=request)
+        ))
+        for _ in range(2):
+            with pytest.raises(httpx.HTTPStatusError):
+                await cache.get_or_fetch("busy", 60, busy, not_found="")
+        assert busy.calls == 2
+
+        # Without a not_found value a 404 propagates
+        with pytest.raises(httpx.HTTPStatusError):
+            await cache.get_or_fetch("other", 60, _Fetcher(error=_not_found_error()))
+
+    asyncio.run(run())
+
+
+def test_get_or_fetch_enabled_serves_hits_and_refreshes():
+    async def run():
+        cache = ResponseCache(policy=CachePolicy.ENABLED)
+        fetch = _Fetcher("value")
+        assert await cache.get_or_fetch("k", 60, fetch) == "value 1"
+        assert await cache.get_or_fetch("k", 60, fetch) == "value 1"
+        assert await cache.get_or_fetch("k", 60, fetch, refresh=True) == "value 2"
+        assert await cache.get_or_fetch("k", 60, fetch) == "value 2"
+
+    asyncio.run(run())
+
+
+def test_get_or_fetch_disabled_always_fetches():
+    async def run():
+        cache = ResponseCache(policy=CachePolicy.DISABLED)
+        fetch = _Fetcher("value")
+        assert await cache.get_or_fetch("k", 60, fetch) == "value 1"
+        assert await cache.get_or_fetch("k", 60, fetch) == "value 2"
+        assert cache.get("k") == (False, None)
+
+    asyncio.run(run())
+
+
+def test_get_or_fetch_replay_serves_hits_and_raises_on_miss():
+    async def run():
+        cache = ResponseCache(policy=CachePolicy.REPLAY)
+        cache.set("k", "recorded", ttl=None)
+        fetch = _Fetcher("value")
+        assert await cache.get_or_fetch("k", 60, fetch) == "recorded"
+        assert await cache.get_or_fetch("k", 60, fetch, refresh=True) == "recorded"
+        with pytest.raises(CacheMissError):
+            await cache.get_or_fetch("missing", 60, fetch)
+        assert fetch.calls == 0
+
+    asyncio.run(run())
+
+
+def test_cache_policy_from_env_falls_back_to_enabled(monkeypatch):
+    monkeypatch.setenv("TEST_CACHE_POLICY", " Disabled ")
+    assert CachePolicy.from_env("TEST_CACHE_POLICY") is CachePolicy.DISABLED
+    # Replay can't be satisfied by an in-memory cache in a fresh process
+    for value in ("replay", "sometimes"):
+        monkeypatch.setenv("TEST_CACHE_POLICY", value)
+        assert CachePolicy.from_env("TEST_CACHE_POLICY") is CachePolicy.ENABLED
+    monkeypatch.delenv("TEST_CACHE_POLICY")
+    assert CachePolicy.from_env("TEST_CACHE_POLICY") is CachePolicy.ENABLED
+
+
+def test_client_lifespan_closes_shared_client():
+    async def run():
+        async with client_lifespan(None):
+            client = await get_client()
+            assert await get_client() is client
+        return client
+
+    client = asyncio.run(run())
+    assert client.is_closed
+    assert http_client._client is None
@@ -0,0 +1,45 @@
+"""
+Offline tests for locating JSON objects in (streamed) LLM output
+"""
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.json_stream import JsonBlockScanner, find_json_block, stream_json_block
+
+
+def test_find_json_block_skips_braces_inside_strings():
+    text = 'Sure! {"a": "}{", "b": {"c": "say \\"hi\\" {"}} and {"second": 1}'
+    assert find_json_block(text) == '{"a": "}{", "b": {"c": "say \\"hi\\" {"}}'
+
+
+def test_find_json_block_without_complete_object():
+    assert find_json_block("no json here") is None
+    assert find_json_block('{"open": [1, 2') is None
+
+
+def test_scanner_matches_across_arbitrary_chunk_boundaries():
+    text = 'prefix {"x": "a\\\\", "y": {"z": "}"}} suffix'
+    expected_end = text.index(' suffix')
+    for size in range(1, len(text)):
+        scanner = JsonBlockScanner()
+        end = -1
+        for i in range(0, len(text), size):
+            end = scanner.feed(text[i:i + size])
+            if end >= 0:
+                break
+        assert (scanner.start, end) == (text.index('{'), expected_end), size
+
+
+def test_stream_json_block_stops_after_first_object(fake_llm):
+    llm = fake_llm(pieces=['Here: {"a": ', [{"text": '1}'}], ' and more', ' text'])
+    assert asyncio.run(stream_json_block(llm, [])) == '{"a": 1}'
+    assert llm.consumed == 2
+    assert llm.closed
+
+
+def test_stream_json_block_returns_full_text_without_object(fake_llm):
+    llm = fake_llm(pieces=["no ", "json"])
+    assert asyncio.run(stream_json_block(llm, [])) == "no json"
@@ -0,0 +1,72 @@
+"""
+Offline tests for the SQLite-backed LLM response cache
+"""
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.messages import HumanMessage
+
+from src.utils import llm_cache
+from src.utils.llm_cache import LLMCache
+
+MESSAGES = [HumanMessage(content="Write a scenario")]
+
+
+def test_namespace_separates_endpoint_and_temperature():
+    namespaces = {
+        LLMCache.make_namespace("openai", "gpt-4o"),
+        LLMCache.make_namespace("openai", "gpt-4o", "http://localhost:8000/v1"),
+        LLMCache.make_namespace("openai", "gpt-4o", None, 0.0),
+        LLMCache.make_namespace("openai", "gpt-4o", None, 0.7),
+    }
+    assert len(namespaces) == 4
+    assert LLMCache.make_namespace("openai", "gpt-4o", "", 0.0) == LLMCache.make_namespace("openai", "gpt-4o", None, 0.0)
+
+
+def test_get_or_call_serves_hits_and_refresh_replaces_entry(tmp_path, fake_llm):
+    cache = LLMCache(db_path=str(tmp_path / "cache.db"))
+    llm = fake_llm()
+    namespace = LLMCache.make_namespace("openai", "gpt-4o", None, 0.0)
+
+    async def run():
+        first = await cache.get_or_call(namespace, MESSAGES, llm.ainvoke)
+        hit = await cache.get_or_call(namespace, MESSAGES, llm.ainvoke)
+        refreshed = await cache.get_or_call(namespace, MESSAGES, llm.ainvoke, refresh=True)
+        after_refresh = await cache.get_or_call(namespace, MESSAGES, llm.ainvoke)
+        other_model = await cache.get_or_call(
+            LLMCache.make_namespace("openai", "gpt-4o", None, 0.7), MESSAGES, llm.ainvoke
+        )
+        return first, hit, refreshed, after_refresh, other_model
+
+    first, hit, refreshed, after_refresh, other_model = asyncio.run(run())
+    assert (first, hit) == ("answer 1", "answer 1")
+    assert (refreshed, after_refresh) == ("answer 2", "answer 2")
+    assert other_model == "answer 3"
+    assert llm.calls == 3
+
+
+def test_disabled_cache_always_calls(tmp_path, fake_llm):
+    cache = LLMCache(db_path=str(tmp_path / "cache.db"), enabled=False)
+    llm = fake_llm()
+
+    async def run():
+        for _ in range(2):
+            await cache.get_or_call("ns", MESSAGES, llm.ainvoke)
+
+    asyncio.run(run())
+    assert llm.calls == 2
+    assert not (tmp_path / "cache.db").exists()
+
+
+def test_default_cache_is_opt_in(monkeypatch, tmp_path):
+    monkeypatch.setenv("LLM_CACHE_PATH", str(tmp_path / "cache.db"))
+    monkeypatch.delenv("LLM_CACHE_ENABLED", raising=False)
+    monkeypatch.setattr(llm_cache, "_default_cache", None)
+    assert not llm_cache.get_default_cache().enabled
+
+    monkeypatch.setenv("LLM_CACHE_ENABLED", "true")
+    monkeypatch.setattr(llm_cache, "_default_cache", None)
+    assert llm_cache.get_default_cache().enabled
@@ -0,0 +1,70 @@
+"""
+Offline tests for the PR test plan generator's parsing helpers (no LLM calls)
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.agent.pr_testing import test_generator
+
+PLAN_JSON = '{"summary": "Login plan", "test_scenarios": [], "manual_steps": []}'
+
+
+def test_parse_llm_response_prefers_json_fence(bare_test_generator):
+    response = f"Setup:\n```bash\nnpm install\n```\nPlan:\n```json\n{PLAN_JSON}\n```"
+    plan = bare_test_generator._parse_llm_response(response, 7)
+    assert plan.pr_id == 7
+    assert plan.summary == "Login plan"
+
+
+def test_parse_llm_response_falls_back_to_first_fence(bare_test_generator):
+    plan = bare_test_generator._parse_llm_response(f"```\n{PLAN_JSON}\n```\ntrailing text", 7)
+    assert plan.summary == "Login plan"
+
+
+def test_unsupported_structured_output_falls_back_to_json_prompt(monkeypatch):
+    class NoToolsLLM:
+        def with_structured_output(self, *args, **kwargs):
+            raise NotImplementedError("tool calling not supported")
+
+    monkeypatch.setattr(test_generator.llm_provider, "get_llm_model", lambda **kwargs: NoToolsLLM())
+    generator = test_generator.TestGenerator(provider="openai", model_name="gpt-4o")
+    assert generator.structured_llm is None
+    assert generator._system_message.content == generator.SYSTEM_PROMPT
+
+
+def test_fallback_plans_do_not_share_nested_models(bare_test_generator):
+    first = bare_test_generator._parse_llm_response("not json", 1)
+    first.test_scenarios[0].name = "edited"
+    first.manual_steps[0].expected_result = "edited"
+    first.prerequisites.append("edited")
+
+    second = bare_test_generator._parse_llm_response("not json", 2)
+    assert second.pr_id == 2
+    assert second.test_scenarios[0].name != "edited"
+    assert second.manual_steps[0].expected_result != "edited"
+    assert "edited" not in second.prerequisites
+
+
+def test_parse_llm_response_unfenced_and_invalid_json(bare_test_generator):
+    assert bare_test_generator._parse_llm_response(f"  {PLAN_JSON}\n", 3).summary == "Login plan"
+
+    fallback = bare_test_generator._parse_llm_response("```json\n{not json", 3)
+    assert fallback.pr_id == 3
+    assert fallback.summary == test_generator._FALLBACK_TEMPLATE.summary
+
+    # Valid JSON that doesn't fit the schema also falls back
+    assert bare_test_generator._parse_llm_response('{"test_scenarios": "oops"}', 3).summary == fallback.summary
+
+
+def test_strip_html_removes_markup_and_caps_length():
+    html = '<div>Fix <b>login</b> &amp; logout<!-- note --><script>alert(1)</script><style>p{}</style></div>'
+    assert test_generator._strip_html(html, 200) == "Fix login & logout"
+    assert test_generator._strip_html(html, 5) == "Fix l"
+
+
+def test_strip_html_does_not_leave_half_a_tag_from_the_raw_cut():
+    limit = test_generator._MAX_RAW_HTML_CHARS
+    html = "x" * (limit - 3) + '<span class="long">' + "y" * 100
+    assert test_generator._strip_html(html, limit) == "x" * (limit - 3)